@@ -1,5 +1,6 @@
 import collections
-import difflib
+
+from .utils.structures import NgramIndex
 
 
 class Mapping(collections.namedtuple('BaseMapping', ['mapping', 'backend'])):
@@ -34,6 +35,86 @@ class AliasesDatabase(object):
         if aliases:
             self.aliases = aliases
 
+    @property
+    def aliases(self):
+        """
+        Dictionary of the aliases and their mappings. If the database was set
+        up with :meth:`set_loader`, the aliases are loaded on first access.
+        """
+        if self._aliases is None:
+            # Only discard the loader once it succeeded so that a failed load is tried again on next access
+            self._aliases = self._loader()
+            self._loader = None
+            self._invalidate_indexes()
+
+        return self._aliases
+
+    @aliases.setter
+    def aliases(self, aliases):
+        self._aliases = aliases
+        self._loader = None
+        self._invalidate_indexes()
+
+    def set_loader(self, loader):
+        """
+        Discard the current aliases and use the given `loader` to get them
+        when they're first needed. `loader` is a callable returning a
+        dictionary containing :py:class:`Mapping` objects.
+        """
+        self._aliases = None
+        self._loader = loader
+        self._invalidate_indexes()
+
+    def load(self):
+        """
+        Load the aliases now if they haven't been loaded yet.
+        """
+        return self.aliases
+
+    def _invalidate_indexes(self):
+        """
+        Discard the indexes of the aliases. They'll be built again from the
+        aliases when they're needed.
+        """
+        self._close_matches_index = None
+        self._aliases_by_mapping = None
+        self._aliases_by_project = None
+        self._aliases_by_backend = None
+
+    def _build_indexes(self):
+        """
+        Build the indexes of the aliases by mapping, by project id and by
+        backend if they don't exist. Each index maps a key to a dict whose
+        keys are the matching aliases (used as an ordered set).
+        """
+        if self._aliases_by_mapping is not None:
+            return
+
+        # Load the aliases first since loading them discards the indexes
+        aliases = self.aliases
+        self._aliases_by_mapping = collections.defaultdict(dict)
+        self._aliases_by_project = collections.defaultdict(dict)
+        self._aliases_by_backend = collections.defaultdict(dict)
+
+        for alias, mapping in aliases.items():
+            self._add_to_indexes(alias, mapping)
+
+    def _add_to_indexes(self, alias, mapping):
+        self._aliases_by_mapping[mapping][alias] = None
+        self._aliases_by_backend[mapping.backend][alias] = None
+
+        if mapping.mapping is not None:
+            self._aliases_by_project[mapping.mapping[0]][alias] = None
+
+    def _remove_from_indexes(self, alias, mapping):
+        for index, key in ((self._aliases_by_mapping, mapping), (self._aliases_by_backend, mapping.backend),
+                           (self._aliases_by_project, mapping.mapping[0] if mapping.mapping is not None else None)):
+            if key in index:
+                index[key].pop(alias, None)
+
+                if not index[key]:
+                    del index[key]
+
     def __getitem__(self, key):
         """
         Return the corresponding :py:class:`Mapping` object. It might raise
@@ -42,6 +123,15 @@ class AliasesDatabase(object):
         return self.aliases[key]
 
     def __setitem__(self, key, value):
+        if key not in self.aliases:
+            self._close_matches_index = None
+
+        if self._aliases_by_mapping is not None:
+            if key in self.aliases:
+                self._remove_from_indexes(key, self.aliases[key])
+
+            self._add_to_indexes(key, value)
+
         self.aliases[key] = value
 
     def __contains__(self, key):
@@ -66,7 +156,8 @@ class AliasesDatabase(object):
         return list(self.aliases.keys())
 
     def update(self, other):
-        self.aliases.update(other)
+        for key, value in dict(other).items():
+            self[key] = value
 
     def reset(self):
         """
@@ -79,14 +170,30 @@ class AliasesDatabase(object):
         Return the reversed aliases dict. Instead of being in the form
         {'alias': mapping}, the dict is in the form {mapping: 'alias'}.
         """
-        return dict((v, k) for k, v in self.aliases.items())
+        self._build_indexes()
+
+        return {mapping: list(aliases)[-1] for mapping, aliases in self._aliases_by_mapping.items()}
+
+    def get_mapping_aliases(self, mapping):
+        """
+        Return the list of aliases that have the given `mapping`, which must
+        be a :py:class:`Mapping` object.
+        """
+        self._build_indexes()
+
+        return list(self._aliases_by_mapping.get(mapping, ()))
 
     def get_close_matches(self, alias):
         """
-        Return the aliases that look like the given alias.
+        Return the aliases that look like the given alias. The aliases are
+        indexed by their n-grams the first time this is called so that only
+        the aliases that have characters in common with `alias` are compared
+        to it.
         """
-        return difflib.get_close_matches(alias,
-                                         self.keys(), cutoff=0.2)
+        if self._close_matches_index is None:
+            self._close_matches_index = NgramIndex(self.keys())
+
+        return self._close_matches_index.get_close_matches(alias, cutoff=0.2)
 
     def filter_from_mapping(self, mapping, backend=None):
         """
@@ -95,16 +202,23 @@ class AliasesDatabase(object):
         that only match the first item of `mapping` (useful to show all
         mappings for a given project).
         """
-        def mapping_filter(key_item):
-            key, item = key_item
-
-            return (
-                (mapping is None or item.mapping == mapping or
-                    (mapping[1] is None and item.mapping is not None and item.mapping[0] == mapping[0])) and
-                (backend is None or item.backend == backend)
-            )
-
-        items = [item for item in self.items() if mapping_filter(item)]
+        self._build_indexes()
+
+        if mapping is None:
+            aliases = self._aliases_by_backend.get(backend, ()) if backend is not None else self.aliases.keys()
+        elif mapping[1] is None:
+            aliases = self._aliases_by_project.get(mapping[0], ())
+        else:
+            aliases = [
+                alias
+                for mapping_backend in ([backend] if backend is not None else list(self._aliases_by_backend))
+                for alias in self._aliases_by_mapping.get(Mapping(mapping=mapping, backend=mapping_backend), ())
+            ]
+
+        items = [
+            (alias, self.aliases[alias]) for alias in aliases
+            if backend is None or self.aliases[alias].backend == backend
+        ]
 
         aliases = collections.OrderedDict(
             sorted(items, key=lambda alias: alias[1].mapping
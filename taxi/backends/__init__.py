@@ -35,6 +35,34 @@ class BaseBackend(object):
         """
         pass
 
+    def push_entries(self, entries):
+        """
+        Called with all the entries that should be pushed to the backend at
+        once, if the backend overrides it. `entries` is a list of `(date,
+        entry)` tuples, as for :meth:`push_entry`.
+
+        Return a list with one item per entry, in the same order as
+        `entries`: either the additional information to display for the
+        entry (or `None`) if it was pushed, or the exception that made it
+        fail. If the whole batch fails, raise an exception, or raise
+        :class:`PushEntriesFailed` with ``entries`` being a dictionary
+        containing the failed entries as keys and error messages as values.
+
+        The default implementation calls :meth:`push_entry` for each entry.
+        Only override this method if your backend can push several entries
+        at once, since entries pushed with :meth:`push_entry` are reported
+        as soon as they're pushed.
+        """
+        results = []
+
+        for date, entry in entries:
+            try:
+                results.append(self.push_entry(date, entry))
+            except Exception as e:
+                results.append(e)
+
+        return results
+
     def get_projects(self):
         """
         Return a list of projects and activities. These will be then stored for
@@ -43,6 +71,24 @@ class BaseBackend(object):
         """
         return []
 
+    def get_projects_since(self, sync_token):
+        """
+        Return the projects that changed since the synchronization identified
+        by `sync_token`, for backends that support incremental updates. The
+        return value should be a tuple `(projects, removed_projects_ids,
+        sync_token)`, where `projects` is a list of the
+        :class:`~taxi.projects.Project` objects that were added or changed,
+        `removed_projects_ids` a list of the ids of the projects that were
+        removed, and `sync_token` the token to give at the next update.
+
+        `sync_token` is `None` if the projects database has no projects for
+        this backend yet, in which case all the projects should be returned.
+        The default implementation returns `None`, meaning that the backend
+        doesn't support incremental updates and that :meth:`get_projects`
+        should be used instead.
+        """
+        return None
+
     def post_push_entries(self):
         """
         Called after the entries have been pushed. Useful if you need to do
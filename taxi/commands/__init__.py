@@ -1,4 +0,0 @@
-from . import (  # NOQA
-    base, alias, autofill, clean_aliases, config, commit, current, edit, plugin,
-    project, show, start, status, stop, update
-)
@@ -97,7 +97,7 @@ def show_mapping(ctx, mapping_str, backend):
     for alias, m in aliases_database.filter_from_mapping(mapping, backend).items():
         ctx.obj['view'].mapping_detail(
             (alias, m),
-            ctx.obj['projects_db'].get(m.mapping[0], m.backend)
+            ctx.obj['projects_db'].get_mapping_summary(m)[0]
             if m.mapping is not None else None
         )
 
@@ -116,7 +116,7 @@ def list_aliases(ctx, search, backend, used, include_inactive: bool):
 
     for alias, m in aliases_mappings.items():
         if m.mapping is not None:
-            project, activity = ctx.obj['projects_db'].mapping_to_project(m)
+            project, activity = ctx.obj['projects_db'].get_mapping_summary(m)
         else:
             project = None
             activity = None
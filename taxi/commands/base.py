@@ -1,5 +1,7 @@
+import collections
 import datetime
 import functools
+import importlib
 import logging
 import os
 import pkgutil
@@ -7,19 +9,19 @@ import sys
 
 import click
 from appdirs import AppDirs
-from click._termui_impl import Editor
 
 from .. import __version__
 from ..aliases import aliases_database
 from ..plugins import plugins_registry
 from ..projects import ProjectsDb
 from ..settings import Settings
-from ..timesheet import TimesheetCollection, TimesheetParser
+from ..timesheet import TimesheetCollection, TimesheetParser, TimesheetsCache
 from ..ui.tty import TtyUi
 from .types import Date, ExpandedPath, Hostname
 
 logger = logging.getLogger(__name__)
 xdg_dirs = AppDirs("taxi", "sephii")
+plugins_registry.cache_path = xdg_dirs.user_cache_dir
 
 # Disable click 5.0 unicode_literals warnings. See
 # http://click.pocoo.org/5/python3/
@@ -42,7 +44,9 @@ def get_timesheet_collection_for_context(ctx, entries_file=None):
     )
 
     try:
-        return TimesheetCollection.load(entries_file, ctx.obj['settings']['nb_previous_files'], parser)
+        return TimesheetCollection.load(
+            entries_file, ctx.obj['settings']['nb_previous_files'], parser, cache=ctx.obj['timesheets_cache']
+        )
     except ValueError as e:
         raise click.ClickException(str(e))
 
@@ -51,9 +55,12 @@ def get_all_aliases(projects_db, settings):
     return dict(projects_db.get_aliases(), **settings.get_aliases())
 
 
-def populate_aliases(aliases):
-    aliases_database.reset()
-    aliases_database.update(aliases)
+def populate_aliases_lazily(projects_db, settings):
+    """
+    Set up the aliases database so that aliases are only read from the projects database and the settings when a
+    command needs them.
+    """
+    aliases_database.set_loader(lambda: get_all_aliases(projects_db=projects_db, settings=settings))
 
 
 def populate_backends(backends, context):
@@ -69,6 +76,8 @@ def create_config_file(filename, run_conversions=True):
     import textwrap
     from urllib import parse
 
+    from click._termui_impl import Editor
+
     if not os.path.exists(filename):
         old_default_config_file = os.path.join(os.path.dirname(filename),
                                                '.tksrc')
@@ -163,6 +172,32 @@ class AliasedCommand(click.Command):
         super(AliasedCommand, self).__init__(*args, **kwargs)
 
 
+#: Definition of a command that is only imported when it's used. `module` is the module that defines the command,
+#: `short_help` and `aliases` are the command short help and aliases, used to list and resolve the command without
+#: importing its module.
+LazyCommand = collections.namedtuple('LazyCommand', ['module', 'short_help', 'aliases'])
+
+#: Built-in commands. They need to be kept in sync with the commands definitions.
+BUILTIN_COMMANDS = {
+    'alias': LazyCommand('taxi.commands.alias', "List or manage aliases.", ()),
+    'autofill': LazyCommand('taxi.commands.autofill', "Fill the entries file with all dates of the month.", ()),
+    'clean-aliases': LazyCommand(
+        'taxi.commands.clean_aliases', "Remove aliases mapping to closed or inexistent activities.", ()
+    ),
+    'commit': LazyCommand('taxi.commands.commit', "Commit entries to the backend.", ('ci',)),
+    'config': LazyCommand('taxi.commands.config', "Open configuration file in your editor.", ()),
+    'current': LazyCommand('taxi.commands.current', "Show the current entry in progress.", ()),
+    'edit': LazyCommand('taxi.commands.edit', "Open the entries file in your editor.", ()),
+    'plugin': LazyCommand('taxi.commands.plugin', "", ()),
+    'project': LazyCommand('taxi.commands.project', "List and show projects, add aliases for activities.", ()),
+    'show': LazyCommand('taxi.commands.show', "Resolve any object passed to it (aliases, projects, etc).", ()),
+    'start': LazyCommand('taxi.commands.start', "Add entry with the current time to the entries file.", ()),
+    'status': LazyCommand('taxi.commands.status', "Show a summary of your entries.", ()),
+    'stop': LazyCommand('taxi.commands.stop', "Record time spent on an activity.", ()),
+    'update': LazyCommand('taxi.commands.update', "Fetch projects and shared aliases from backends.", ()),
+}
+
+
 class AliasedGroup(click.Group):
     """
     Command group that supports both custom aliases and prefix-matching. The
@@ -171,18 +206,31 @@ class AliasedGroup(click.Group):
         * Exact command name
         * Command aliases
         * Command prefix
+
+    Commands listed in `lazy_commands` (a dict of command names and
+    :class:`LazyCommand` objects) are only imported when they're resolved.
     """
+    def __init__(self, *args, **kwargs):
+        self.lazy_commands = kwargs.pop('lazy_commands', {})
+        super(AliasedGroup, self).__init__(*args, **kwargs)
+
     def get_command(self, ctx, cmd_name):
-        rv = super(AliasedGroup, self).get_command(ctx, cmd_name)
-        # Exact command exists, go with this
+        rv = self.get_loaded_command(ctx, cmd_name)
         if rv is not None:
             return rv
 
-        # Check in aliases
-        for name, command in self.commands.items():
-            if (isinstance(command, AliasedCommand)
-                    and cmd_name in command.aliases):
-                return super(AliasedGroup, self).get_command(ctx, name)
+        # Built-in commands are only imported when needed
+        lazy_command_name = self.get_lazy_command_name(cmd_name)
+        if lazy_command_name is not None:
+            importlib.import_module(self.lazy_commands[lazy_command_name].module)
+            return super(AliasedGroup, self).get_command(ctx, lazy_command_name)
+
+        # Custom commands are only loaded when needed, starting with the one that has the requested name
+        for name in (cmd_name, None):
+            if plugins_registry.register_commands(name):
+                rv = self.get_loaded_command(ctx, cmd_name)
+                if rv is not None:
+                    return rv
 
         # Check in prefixes
         matches = [x for x in self.list_commands(ctx)
@@ -190,11 +238,70 @@ class AliasedGroup(click.Group):
         if not matches:
             return None
         elif len(matches) == 1:
-            return click.Group.get_command(self, ctx, matches[0])
+            return self.get_command(ctx, matches[0])
         ctx.fail('Too many matches: %s' % ', '.join(sorted(matches)))
 
         return None
 
+    def get_loaded_command(self, ctx, cmd_name):
+        """
+        Return the command that has the given name or alias among the commands that are already loaded.
+        """
+        rv = super(AliasedGroup, self).get_command(ctx, cmd_name)
+        # Exact command exists, go with this
+        if rv is not None:
+            return rv
+
+        # Check in aliases
+        for name, command in self.commands.items():
+            if (isinstance(command, AliasedCommand)
+                    and cmd_name in command.aliases):
+                return super(AliasedGroup, self).get_command(ctx, name)
+
+        return None
+
+    def get_lazy_command_name(self, cmd_name):
+        """
+        Return the name of the lazy command that has the given name or alias, or `None` if there's no such command.
+        """
+        if cmd_name in self.lazy_commands:
+            return cmd_name
+
+        for name, command in self.lazy_commands.items():
+            if cmd_name in command.aliases:
+                return name
+
+        return None
+
+    def list_commands(self, ctx):
+        plugins_registry.register_commands()
+
+        return sorted(set(super(AliasedGroup, self).list_commands(ctx)) | set(self.lazy_commands))
+
+    def format_commands(self, ctx, formatter):
+        """
+        Write the list of commands and their short help. The short help of the lazy commands that are not loaded yet
+        is taken from their definition so that they don't need to be imported.
+        """
+        commands = []
+        for name in self.list_commands(ctx):
+            command = self.commands.get(name)
+
+            if command is None:
+                commands.append((name, None))
+            elif not command.hidden:
+                commands.append((name, command))
+
+        if commands:
+            limit = formatter.width - 6 - max(len(name) for name, command in commands)
+            rows = [
+                (name, command.get_short_help_str(limit) if command else self.lazy_commands[name].short_help)
+                for name, command in commands
+            ]
+
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
 
 def date_options(func):
     """
@@ -258,7 +365,7 @@ def get_data_dir():
     return xdg_dirs.user_data_dir
 
 
-@click.group(cls=AliasedGroup)
+@click.group(cls=AliasedGroup, lazy_commands=BUILTIN_COMMANDS)
 @click.option('--config', '-c', default=get_config_file(),
               type=ExpandedPath(dir_okay=False),
               help="Path to the configuration file to use.")
@@ -306,12 +413,9 @@ def cli(ctx, config, taxi_dir, verbose):
     ctx.obj['settings'] = settings
     ctx.obj['view'] = TtyUi()
     ctx.obj['projects_db'] = projects_db
+    ctx.obj['timesheets_cache'] = TimesheetsCache(os.path.join(taxi_dir, 'timesheets_cache'))
     ctx.obj['config_path'] = config
 
     if not is_config:
-        populate_aliases(get_all_aliases(projects_db=projects_db, settings=settings))
+        populate_aliases_lazily(projects_db, settings)
         populate_backends(settings.get_backends(), ctx.obj)
-
-
-# This can't be called from inside a command because Click will already have built its commands list
-plugins_registry.register_commands()
@@ -1,16 +1,19 @@
-from collections import defaultdict
+from collections import defaultdict, deque
+import concurrent.futures
 import itertools
 import logging
 
 import click
 
 from ..aliases import aliases_database
-from ..backends import PushEntriesFailed
+from ..backends import BaseBackend, PushEntriesFailed, PushEntryFailed
 from ..plugins import plugins_registry
 from .base import AliasedCommand, cli, date_options, get_timesheet_collection_for_context
 
 logger = logging.getLogger(__name__)
 
+INTERRUPTED_PUSH_ERROR = "Interrupted, check status in backend"
+
 
 @cli.command(cls=AliasedCommand, aliases=['ci'], short_help="Commit entries to the backend.")
 @click.option('-f', '--file', 'f',
@@ -41,31 +44,24 @@ def commit(ctx, f, force_yes, date):
 
     try:
         # Push entries
-        for timesheet in timesheet_collection.timesheets:
-            entries_to_push = get_entries_to_push(
+        entries_to_push = [
+            (entries_date, entry, plugins_registry.get_backend(aliases_database[entry.alias].backend))
+            for timesheet in timesheet_collection.timesheets
+            for entries_date, entries in get_entries_to_push(
                 timesheet, date, ctx.obj['settings']['regroup_entries']
-            )
+            ).items()
+            for entry in entries
+        ]
 
-            for entries_date, entries in entries_to_push.items():
-                for entry in entries:
-                    backend_name = aliases_database[entry.alias].backend
-                    backend = plugins_registry.get_backend(backend_name)
-                    backends_entries[backend].append(entry)
-
-                    try:
-                        additional_info = backend.push_entry(entries_date, entry)
-                    except KeyboardInterrupt:
-                        entry.push_error = ("Interrupted, check status in"
-                                            " backend")
-                        raise
-                    except Exception as e:
-                        logger.exception("Error during push")
-                        additional_info = None
-                        entry.push_error = str(e)
-                    else:
-                        entry.push_error = None
-                    finally:
-                        ctx.obj['view'].pushed_entry(entry, additional_info)
+        def pushed_entry(entry, backend, additional_info):
+            backends_entries[backend].append(entry)
+            ctx.obj['view'].pushed_entry(entry, additional_info)
+
+        push_workers = ctx.obj['settings']['push_workers']
+        if push_workers > 1:
+            push_entries_concurrently(entries_to_push, push_workers, pushed_entry)
+        else:
+            push_entries(entries_to_push, pushed_entry)
 
         # Call post_push_entries on backends
         backends_post_push(backends_entries)
@@ -84,6 +80,160 @@ def commit(ctx, f, force_yes, date):
                                            ignored_entries_list)
 
 
+def supports_batch_push(backend):
+    """
+    Return True if `backend` overrides :meth:`~taxi.backends.BaseBackend.push_entries` and should thus be given all its
+    entries at once.
+    """
+    return type(backend).push_entries is not BaseBackend.push_entries
+
+
+def get_batches(entries_to_push):
+    """
+    Return a dictionary mapping backends that support batch pushes to the list of `(position, date, entry)` tuples they
+    should push, `position` being the position of the entry in `entries_to_push`.
+    """
+    batches = defaultdict(list)
+    batch_backends = {}
+
+    for position, (entries_date, entry, backend) in enumerate(entries_to_push):
+        if backend not in batch_backends:
+            batch_backends[backend] = supports_batch_push(backend)
+
+        if batch_backends[backend]:
+            batches[backend].append((position, entries_date, entry))
+
+    return batches
+
+
+def push_entry(backend, entries_date, entry):
+    """
+    Push the given `entry` to `backend` and return a tuple `(additional_info, push_error)`, `push_error` being `None` if
+    the push succeeded.
+    """
+    try:
+        additional_info = backend.push_entry(entries_date, entry)
+    except Exception as e:
+        logger.exception("Error during push")
+        return None, str(e)
+
+    return additional_info, None
+
+
+def push_batch(backend, batch):
+    """
+    Push the given `batch`, as returned by :func:`get_batches`, to `backend` and return a dictionary mapping the
+    position of each entry to a tuple `(additional_info, push_error)`.
+    """
+    try:
+        results = backend.push_entries([(entries_date, entry) for position, entries_date, entry in batch])
+
+        if len(results) != len(batch):
+            raise ValueError("Backend returned %d results for %d entries" % (len(results), len(batch)))
+    except PushEntriesFailed as e:
+        logger.exception("Error during push")
+
+        if e.entries:
+            results = [
+                PushEntryFailed(e.entries[entry] or str(e)) if entry in e.entries else None
+                for position, entries_date, entry in batch
+            ]
+        else:
+            results = [e] * len(batch)
+    except Exception as e:
+        logger.exception("Error during push")
+        results = [e] * len(batch)
+
+    return {
+        position: (None, str(result)) if isinstance(result, Exception) else (result, None)
+        for (position, entries_date, entry), result in zip(batch, results)
+    }
+
+
+def push_entries(entries_to_push, pushed_entry):
+    """
+    Push the entries from `entries_to_push`, a list of `(date, entry, backend)` tuples, one after the other.
+    `pushed_entry` is called with the entry, its backend and the additional info returned by the backend each time an
+    entry has been pushed. Backends that support it push all their entries at once when their first entry is reached.
+    """
+    batches = get_batches(entries_to_push)
+    batches_results = {}
+
+    for position, (entries_date, entry, backend) in enumerate(entries_to_push):
+        additional_info = None
+
+        try:
+            if backend in batches:
+                if backend not in batches_results:
+                    batches_results[backend] = push_batch(backend, batches[backend])
+
+                additional_info, entry.push_error = batches_results[backend][position]
+            else:
+                additional_info, entry.push_error = push_entry(backend, entries_date, entry)
+        except KeyboardInterrupt:
+            entry.push_error = INTERRUPTED_PUSH_ERROR
+            raise
+        finally:
+            pushed_entry(entry, backend, additional_info)
+
+
+def push_entries_concurrently(entries_to_push, nb_workers, pushed_entry):
+    """
+    Same as :func:`push_entries` but use a pool of `nb_workers` threads for each backend so that several entries (or
+    batches of entries) are pushed at the same time. `pushed_entry` is still called from the calling thread, in the
+    order of `entries_to_push`.
+    """
+    executors = {}
+    batches_futures = {}
+    pending_pushes = deque()
+
+    def get_executor(backend):
+        if backend not in executors:
+            executors[backend] = concurrent.futures.ThreadPoolExecutor(max_workers=nb_workers)
+
+        return executors[backend]
+
+    def get_result(future, position):
+        result = future.result()
+
+        return result[position] if isinstance(result, dict) else result
+
+    try:
+        for backend, batch in get_batches(entries_to_push).items():
+            batches_futures[backend] = get_executor(backend).submit(push_batch, backend, batch)
+
+        for position, (entries_date, entry, backend) in enumerate(entries_to_push):
+            if backend in batches_futures:
+                future = batches_futures[backend]
+            else:
+                future = get_executor(backend).submit(push_entry, backend, entries_date, entry)
+
+            pending_pushes.append((position, entry, backend, future))
+
+        while pending_pushes:
+            position, entry, backend, future = pending_pushes[0]
+            additional_info, entry.push_error = get_result(future, position)
+            pending_pushes.popleft()
+            pushed_entry(entry, backend, additional_info)
+    except KeyboardInterrupt:
+        # Entries that were not sent yet are left untouched. Pushes that already started are waited for so that the
+        # entries state matches what's in the backend
+        started_pushes = [
+            (position, entry, backend, future)
+            for position, entry, backend, future in list(pending_pushes)
+            if not future.cancel()
+        ]
+
+        for position, entry, backend, future in started_pushes:
+            additional_info, entry.push_error = get_result(future, position)
+            pushed_entry(entry, backend, additional_info)
+
+        raise
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
 def backends_post_push(backends_entries):
     for backend, entries in backends_entries.items():
         try:
@@ -1,8 +1,15 @@
+import concurrent.futures
+import logging
+
 import click
 
+from ..aliases import aliases_database
 from ..plugins import plugins_registry
+from ..projects import OutdatedProjectsDbException
 from .base import cli
 
+logger = logging.getLogger(__name__)
+
 
 @cli.command(short_help="Fetch projects and shared aliases from backends.")
 @click.pass_context
@@ -12,19 +19,74 @@ def update(ctx):
     aliases.
     """
     ctx.obj['view'].updating_projects_database()
+    # Aliases are loaded lazily but the current ones are needed to show what changed once the projects database has
+    # been updated. An outdated projects database can't be read, but it's about to be replaced anyway
+    try:
+        aliases_database.load()
+    except OutdatedProjectsDbException:
+        aliases_database.aliases = {}
+
+    projects_db = ctx.obj['projects_db']
+    backends = ctx.obj['settings'].get_backends()
+    backends_projects = []
+    sync_tokens = {}
+
+    # Backends usually fetch their projects from a remote server, so fetch them all at the same time
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(len(backends), 1)) as executor:
+        for backend_name, backend_uri in backends:
+            # Backends are instantiated on first use, which fails if eg. their plugin is not installed. Report this
+            # like any other error while fetching the projects so that the other backends are still updated
+            try:
+                backend = plugins_registry.get_backend(backend_name)
+            except Exception as e:
+                future = concurrent.futures.Future()
+                future.set_exception(e)
+            else:
+                future = executor.submit(fetch_projects, backend, projects_db.get_sync_token(backend_name))
+
+            backends_projects.append((backend_name, future))
+
+    # Projects of the backends that returned all their projects, and changes returned by the backends that support
+    # incremental updates
+    complete_projects = {}
+    deltas = {}
 
-    projects = []
+    for backend_name, future in backends_projects:
+        try:
+            changed_projects, removed_projects_ids, sync_token = future.result()
+        except Exception as e:
+            logger.exception("Error while fetching projects from backend %s", backend_name)
+            ctx.obj['view'].projects_database_update_failed(backend_name, e)
+            sync_token = projects_db.get_sync_token(backend_name)
+        else:
+            for project in changed_projects:
+                project.backend = backend_name
 
-    for backend_name, backend_uri in ctx.obj['settings'].get_backends():
-        backend = plugins_registry.get_backend(backend_name)
-        backend_projects = backend.get_projects()
+            # Changes can only be applied if the projects database already contains the projects of the backend
+            if sync_token is not None and projects_db.get_sync_token(backend_name) is not None:
+                deltas[backend_name] = (changed_projects, removed_projects_ids)
+            else:
+                complete_projects[backend_name] = changed_projects
 
-        for project in backend_projects:
-            project.backend = backend_name
+        if sync_token is not None:
+            sync_tokens[backend_name] = sync_token
 
-        projects += backend_projects
+    # Applying the changes only costs as much as the number of changed projects, but if any backend returned all its
+    # projects (eg. on the first update), the whole database needs to be written anyway
+    if deltas and not complete_projects:
+        projects_db.apply_deltas(deltas, sync_tokens, [backend_name for backend_name, backend_uri in backends])
+    else:
+        projects = []
 
-    ctx.obj['projects_db'].update(projects)
+        for backend_name, backend_uri in backends:
+            if backend_name in complete_projects:
+                projects += complete_projects[backend_name]
+            elif backend_name in deltas:
+                projects += merge_projects(get_backend_projects(projects_db, backend_name), *deltas[backend_name])
+            else:
+                projects += get_backend_projects(projects_db, backend_name)
+
+        projects_db.update(projects, sync_tokens)
 
     # The user can have local aliases with additional information (eg. role definition). If these aliases also exist on
     # the remote, then they probably need to be cleared out locally to make sure they don't unintentionally use an
@@ -47,3 +109,39 @@ def update(ctx):
     ctx.obj['view'].projects_database_update_success(
         aliases_after_update, ctx.obj['projects_db']
     )
+
+
+def get_backend_projects(projects_db, backend_name):
+    """
+    Return the projects of the given backend that are currently in the projects database, so that they're kept if the
+    backend can't be reached.
+    """
+    try:
+        return projects_db.get_projects(backend=backend_name)
+    except OutdatedProjectsDbException:
+        return []
+
+
+def fetch_projects(backend, sync_token):
+    """
+    Return a tuple `(projects, removed_projects_ids, sync_token)` with the projects of `backend` that changed since
+    `sync_token`. If the backend doesn't support incremental updates, `projects` is the complete list of its projects
+    and the returned `sync_token` is `None`.
+    """
+    delta = backend.get_projects_since(sync_token)
+
+    if delta is None:
+        return backend.get_projects(), [], None
+
+    return delta
+
+
+def merge_projects(projects, changed_projects, removed_projects_ids):
+    """
+    Return the list of `projects` updated with the given `changed_projects`, and without the projects whose id is in
+    `removed_projects_ids`.
+    """
+    changed_projects_ids = {str(project.id) for project in changed_projects}
+    changed_projects_ids.update(str(project_id) for project_id in removed_projects_ids)
+
+    return [project for project in projects if str(project.id) not in changed_projects_ids] + list(changed_projects)
@@ -1,9 +1,16 @@
-import importlib.metadata
+import hashlib
+import json
+import logging
+import os
 import sys
+import tempfile
+import types
 from urllib import parse
 
 from .exceptions import TaxiException
 
+logger = logging.getLogger(__name__)
+
 
 class PluginsRegistry(object):
     """
@@ -16,7 +23,8 @@ class PluginsRegistry(object):
     of available plugins is automatically discovered by checking the
     ``taxi.backends`` and ``taxi.commands`` entry points.
 
-    Once populated, backend objects can be loaded and retrieved using the :meth:`get_backend` method::
+    Once populated, backend objects can be loaded and retrieved using the :meth:`get_backend` method. Backends are
+    only instantiated the first time they're retrieved::
 
         my_backend = plugins_registry.get_backend('backend_name')
 
@@ -27,28 +35,164 @@ class PluginsRegistry(object):
     COMMANDS_ENTRY_POINT = 'taxi.commands'
     ENTRY_POINTS = (BACKENDS_ENTRY_POINT, COMMANDS_ENTRY_POINT)
 
-    def __init__(self):
-        self._entry_points = {}
+    def __init__(self, cache_path=None):
+        """
+        Create the plugins registry. If `cache_path` is set, the discovered
+        entry points are cached in this directory so that the installed
+        distributions don't need to be scanned every time.
+        """
+        self.cache_path = cache_path
+        self._discovered_entry_points = None
+        self._loaded_commands = set()
+        self._backends_uris = {}
         self._backends_registry = {}
 
-        # Load the entry points and index them to avoid iterating every time we
-        # need a specific plugin
+    @property
+    def _entry_points(self):
+        """
+        Dictionary of the available entry points, indexed by entry point
+        type and then by name to avoid iterating every time we need a
+        specific plugin. Entry points are discovered on first access.
+        """
+        if self._discovered_entry_points is None:
+            self._discovered_entry_points = self._discover_entry_points()
+
+        return self._discovered_entry_points
+
+    @_entry_points.setter
+    def _entry_points(self, entry_points):
+        self._discovered_entry_points = entry_points
+
+    def _discover_entry_points(self):
+        """
+        Return the available entry points, from the cache if the installed
+        distributions didn't change since they were cached.
+        """
+        cache_key = self._get_entry_points_cache_key()
+        entry_points = self._read_entry_points_cache(cache_key)
+
+        if entry_points is not None:
+            return entry_points
+
+        # importlib.metadata is slow to import, and is not needed when the entry points are cached
+        import importlib.metadata
+
+        entry_points = {}
+
         for entry_point_type in self.ENTRY_POINTS:
-            self._entry_points[entry_point_type] = {}
+            entry_points[entry_point_type] = {}
 
             if sys.version_info < (3, 10):
-                entry_points = importlib.metadata.entry_points().get(entry_point_type, [])
+                type_entry_points = importlib.metadata.entry_points().get(entry_point_type, [])
             else:
-                entry_points = importlib.metadata.entry_points(group=entry_point_type)
+                type_entry_points = importlib.metadata.entry_points(group=entry_point_type)
+
+            for entry_point in type_entry_points:
+                entry_points[entry_point_type][entry_point.name] = entry_point
+
+        self._write_entry_points_cache(cache_key, entry_points)
+
+        return entry_points
+
+    def _get_entry_points_cache_file(self):
+        # The cache depends on the Python environment, so use a different file for each one
+        environment_hash = hashlib.sha1(sys.prefix.encode('utf-8')).hexdigest()
+
+        return os.path.join(self.cache_path, 'entry_points-%s.json' % environment_hash)
+
+    def _get_entry_points_cache_key(self):
+        """
+        Return the key identifying the set of installed distributions. Since
+        installing, upgrading or removing a distribution adds or removes its
+        metadata directory, it changes the modification time of the
+        directory it's installed in.
+
+        The current directory is left out of the key since it changes
+        depending on where taxi is run from.
+        """
+        key = []
+        cwd = os.getcwd()
+
+        for path in sys.path:
+            if not path or os.path.abspath(path) == cwd:
+                continue
+
+            try:
+                key.append([path, os.stat(path).st_mtime_ns])
+            except OSError:
+                key.append([path, None])
+
+        return key
+
+    def _read_entry_points_cache(self, cache_key):
+        """
+        Return the cached entry points, or `None` if there's no cache or if
+        it doesn't match `cache_key`.
+        """
+        if self.cache_path is None:
+            return None
+
+        try:
+            with open(self._get_entry_points_cache_file(), 'r') as cache_file:
+                cache = json.load(cache_file)
+
+            if cache['key'] != cache_key:
+                return None
+
+            return {
+                entry_point_type: {
+                    name: CachedEntryPoint(name, value, entry_point_type, dist_name, dist_version)
+                    for name, value, dist_name, dist_version in entry_points
+                }
+                for entry_point_type, entry_points in cache['entry_points'].items()
+            }
+        # A corrupt cache shouldn't prevent plugins from being discovered
+        except Exception:
+            return None
+
+    def _write_entry_points_cache(self, cache_key, entry_points):
+        if self.cache_path is None:
+            return
+
+        cache = {
+            'key': cache_key,
+            'entry_points': {
+                entry_point_type: [
+                    [
+                        entry_point.name, entry_point.value,
+                        entry_point.dist.name if entry_point.dist else None,
+                        entry_point.dist.version if entry_point.dist else None,
+                    ]
+                    for entry_point in type_entry_points.values()
+                ]
+                for entry_point_type, type_entry_points in entry_points.items()
+            }
+        }
+        temp_cache_file = None
+
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+
+            with tempfile.NamedTemporaryFile(
+                    mode='w', dir=self.cache_path, prefix='taxi', delete=False
+            ) as temp_cache_file:
+                json.dump(cache, temp_cache_file)
 
-            for entry_point in entry_points:
-                self._entry_points[entry_point_type][entry_point.name] = entry_point
+            os.replace(temp_cache_file.name, self._get_entry_points_cache_file())
+        except Exception:
+            logger.exception("Could not write entry points cache")
+
+            if temp_cache_file is not None and os.path.exists(temp_cache_file.name):
+                os.unlink(temp_cache_file.name)
 
     def get_plugins(self):
         plugins_list = {}
 
         for entry_point_type, entry_points in self._entry_points.items():
             for entry_point in entry_points.values():
+                if entry_point.dist is None:
+                    continue
+
                 plugin_name = entry_point.dist.name
                 plugin_version = entry_point.dist.version
 
@@ -65,64 +209,104 @@ class PluginsRegistry(object):
 
     def get_backend(self, key):
         """
-        Return the backend instance for the backend with the given name.
+        Return the backend instance for the backend with the given name. The
+        backend is instantiated on first use, which can raise
+        :exc:`BackendNotFoundError` if its entry point could not be found.
         """
+        if key not in self._backends_registry:
+            parsed_uri, context = self._backends_uris[key]
+            self._backends_registry[key] = self._load_backend(parsed_uri, context)
+
         return self._backends_registry[key]
 
     def get_backends_by_class(self, backend_class):
         """
         Return a list of backends that are instances of the given `backend_class`.
         """
-        return [backend for backend in self._backends_registry.values() if isinstance(backend, backend_class)]
+        return [
+            self.get_backend(name) for name, (parsed_uri, context) in self._backends_uris.items()
+            if issubclass(self._get_backend_class(parsed_uri.scheme), backend_class)
+        ]
 
     def populate_backends(self, backends, context):
         """
-        Iterate over the given backends list and instantiate every backend
-        found. Can raise :exc:`BackendNotFoundError` if a backend
-        could not be found in the registered entry points.
+        Register the given backends so that they can be retrieved with
+        :meth:`get_backend`. Backends are only instantiated when they're
+        first used, so that commands that don't use backends don't need to
+        import the backends modules.
 
         The `backends` parameter should be a dict with backend names as keys
         and URIs as values.
         """
         for name, uri in backends.items():
-            self._backends_registry[name] = self._load_backend(uri, context)
+            self._backends_uris[name] = (parse.urlparse(uri), context)
+            self._backends_registry.pop(name, None)
 
-    def _load_backend(self, backend_uri, context):
+    def _get_backend_class(self, scheme):
         """
-        Return the instantiated backend object identified by the given
-        `backend_uri`.
-
-        The entry point that is used to create the backend object is determined
-        by the protocol part of the given URI.
+        Return the backend class registered with the entry point `scheme`.
         """
-        parsed = parse.urlparse(backend_uri)
-        options = dict(parse.parse_qsl(parsed.query))
-
         try:
-            backend = self._entry_points[self.BACKENDS_ENTRY_POINT][parsed.scheme].load()
+            return self._entry_points[self.BACKENDS_ENTRY_POINT][scheme].load()
         except KeyError:
             raise BackendNotFoundError(
                 "The requested backend `%s` could not be found in the "
                 "registered entry points. Perhaps you forgot to install the "
-                "corresponding backend package?" % parsed.scheme
+                "corresponding backend package?" % scheme
             )
 
-        password = (parse.unquote(parsed.password)
-                    if parsed.password
-                    else parsed.password)
+    def _load_backend(self, parsed_uri, context):
+        """
+        Return the instantiated backend object identified by the given
+        `parsed_uri`, as returned by :func:`urllib.parse.urlparse`.
+
+        The entry point that is used to create the backend object is determined
+        by the protocol part of the given URI.
+        """
+        backend = self._get_backend_class(parsed_uri.scheme)
+        options = dict(parse.parse_qsl(parsed_uri.query))
+        password = (parse.unquote(parsed_uri.password)
+                    if parsed_uri.password
+                    else parsed_uri.password)
 
         return backend(
-            username=parsed.username, password=password,
-            hostname=parsed.hostname, port=parsed.port,
-            path=parsed.path, options=options, context=context,
+            username=parsed_uri.username, password=password,
+            hostname=parsed_uri.hostname, port=parsed_uri.port,
+            path=parsed_uri.path, options=options, context=context,
         )
 
-    def register_commands(self):
+    def register_commands(self, name=None):
         """
-        Load entry points for custom commands.
+        Load entry points for custom commands. If `name` is set, only load
+        the entry point with this name. Entry points that have already been
+        loaded are skipped. Return True if any entry point was loaded.
         """
-        for command in self._entry_points[self.COMMANDS_ENTRY_POINT].values():
-            command.load()
+        loaded = False
+
+        for command_name, command in self._entry_points.get(self.COMMANDS_ENTRY_POINT, {}).items():
+            if (name is None or command_name == name) and command_name not in self._loaded_commands:
+                self._loaded_commands.add(command_name)
+                command.load()
+                loaded = True
+
+        return loaded
+
+
+class CachedEntryPoint(object):
+    """
+    Entry point read from the entry points cache. It provides the attributes
+    of :class:`importlib.metadata.EntryPoint` used by the plugins registry.
+    """
+    def __init__(self, name, value, group, dist_name, dist_version):
+        self.name = name
+        self.value = value
+        self.group = group
+        self.dist = types.SimpleNamespace(name=dist_name, version=dist_version) if dist_name else None
+
+    def load(self):
+        import importlib.metadata
+
+        return importlib.metadata.EntryPoint(self.name, self.value, self.group).load()
 
 
 class BackendNotFoundError(TaxiException):
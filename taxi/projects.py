@@ -1,8 +1,10 @@
-from collections import defaultdict
 import copy
 import datetime
 import json
 import os
+import sqlite3
+import tempfile
+import threading
 
 from .aliases import Mapping
 from .exceptions import TaxiException
@@ -128,89 +130,393 @@ class Activity:
 
 
 class ProjectsDb:
-    PROJECTS_FILE = 'projects.json'
+    """
+    Database of the projects fetched from the backends. Projects are stored in an SQLite database so that they can be
+    looked up by id, alias or name without loading the whole database.
+
+    The database can be used from several threads (eg. by backends pushing entries concurrently): they share the same
+    connection, which is only used by one thread at a time.
+    """
+    PROJECTS_FILE = 'projects.sqlite'
+    # Projects database file used before the switch to SQLite. If it exists, it is migrated to the new format
+    JSON_PROJECTS_FILE = 'projects.json'
+    JSON_VERSION = 2
+    # Version of the SQLite database schema, stored in its `user_version`. Increase this when the schema changes so that
+    # existing databases are considered outdated
+    SCHEMA_VERSION = 6
+
+    SCHEMA = """
+        CREATE TABLE projects (
+            position INTEGER PRIMARY KEY,
+            backend TEXT,
+            id TEXT NOT NULL,
+            name TEXT,
+            status INTEGER,
+            start_date TEXT,
+            end_date TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX projects_id ON projects (id, backend);
+        CREATE INDEX projects_backend ON projects (backend);
+
+        CREATE TABLE activities (
+            backend TEXT,
+            project_id TEXT NOT NULL,
+            id TEXT NOT NULL,
+            name TEXT,
+            active INTEGER NOT NULL
+        );
+        CREATE INDEX activities_id ON activities (project_id, id, backend);
+
+        CREATE TABLE search_trigrams (
+            trigram TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            PRIMARY KEY (trigram, position)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE aliases (
+            position INTEGER PRIMARY KEY,
+            alias TEXT NOT NULL,
+            backend TEXT,
+            project_id TEXT NOT NULL,
+            activity_id TEXT NOT NULL
+        );
+        CREATE INDEX aliases_alias ON aliases (alias);
+        CREATE INDEX aliases_project_id ON aliases (project_id, backend);
+
+        CREATE TABLE sync_tokens (
+            backend TEXT PRIMARY KEY,
+            token TEXT NOT NULL
+        );
+    """
 
     def __init__(self, path):
         self.path = path
         self.projects_database_file = os.path.join(self.path,
                                                    self.PROJECTS_FILE)
-        self._projects_by_id_cache = None
+        self.json_projects_database_file = os.path.join(self.path, self.JSON_PROJECTS_FILE)
+        self._connection = None
+        self._lock = threading.RLock()
+        self._projects_by_position = {}
         self._projects_cache = None
 
-    def get_projects(self):
-        if self._projects_cache is not None:
-            return self._projects_cache
+    def _get_connection(self):
+        """
+        Return the connection to the projects database, or `None` if there's no projects database yet (eg. ``taxi
+        update`` not run). Raise :exc:`OutdatedProjectsDbException` if the database needs to be updated. The
+        connection should only be used while holding `_lock`.
+        """
+        if self._connection is not None:
+            return self._connection
+
+        if not os.path.exists(self.projects_database_file) and not self._migrate_json_db():
+            return None
+
+        connection = sqlite3.connect(self.projects_database_file, check_same_thread=False)
 
         try:
-            if not os.stat(self.projects_database_file).st_size:
-                return []
-        # If the db file doesn't exist (eg. ``taxi update`` not run), return an
-        # empty list
+            version = connection.execute('PRAGMA user_version').fetchone()[0]
+        except sqlite3.DatabaseError:
+            version = None
+
+        if version is None or version < self.SCHEMA_VERSION:
+            connection.close()
+            raise OutdatedProjectsDbException()
+
+        connection.create_function('unicode_lower', 1, lambda value: value.lower() if value else value)
+        self._connection = connection
+
+        return connection
+
+    def _migrate_json_db(self):
+        """
+        Import the projects from the JSON projects database used by previous versions of Taxi, if any. Return True if
+        the projects database has been created.
+        """
+        try:
+            if not os.stat(self.json_projects_database_file).st_size:
+                return False
         except OSError:
-            return []
+            return False
 
-        with open(self.projects_database_file, 'r') as projects_db:
+        with open(self.json_projects_database_file, 'r') as projects_db:
             try:
                 lpdb = json.load(projects_db, cls=LocalProjectsDbDecoder)
             # Pre-4.0 used a pickle-based format for the projects db
             except (UnicodeDecodeError, ValueError):
                 raise OutdatedProjectsDbException()
 
-        if lpdb.VERSION < LocalProjectsDb.VERSION:
+        if lpdb.VERSION < self.JSON_VERSION:
             raise OutdatedProjectsDbException()
 
-        self._projects_cache = lpdb.projects
+        self.update(lpdb.projects, lpdb.sync_tokens)
 
-        return lpdb.projects
+        return True
 
-    def update(self, projects):
-        lpdb = LocalProjectsDb(projects)
+    def _query(self, query, params=()):
+        with self._lock:
+            connection = self._get_connection()
 
-        with open(self.projects_database_file, 'w') as output:
-            json.dump(lpdb.get_dump_object(), output)
+            if connection is None:
+                return []
 
-        self._projects_cache = None
-        self._projects_by_id_cache = None
+            return connection.execute(query, params).fetchall()
 
-    def search(self, search, active_only=False, backend=None):
-        projects = self.get_projects()
-        found_list = []
+    def _load_project(self, position, data):
+        """
+        Return the :class:`Project` stored at the given `position` from its serialized `data`. Loaded projects are
+        kept so that looking up the same project several times returns the same object.
+        """
+        with self._lock:
+            if position not in self._projects_by_position:
+                self._projects_by_position[position] = LocalProjectsDb.load_project(json.loads(data))
+
+            return self._projects_by_position[position]
+
+    def get_projects(self, backend=None):
+        if backend is None and self._projects_cache is not None:
+            return self._projects_cache
 
-        for project in projects:
-            found = True
+        if backend is None:
+            rows = self._query('SELECT position, data FROM projects ORDER BY position')
+        else:
+            rows = self._query('SELECT position, data FROM projects WHERE backend = ? ORDER BY position', (backend,))
 
-            for s in search:
-                s = s.lower()
-                found = (project.name.lower().find(s) > -1 or
-                         str(project.id) == s)
+        projects = [self._load_project(position, data) for position, data in rows]
 
-                if not found:
-                    break
+        if backend is None:
+            self._projects_cache = projects
 
-            found = found and (backend is None or project.backend ==
-                               backend)
+        return projects
 
-            if found:
-                if not active_only or project.is_active():
-                    found_list.append(project)
+    def get_sync_token(self, backend):
+        """
+        Return the token returned by the given `backend` at the last
+        incremental update, or `None` if there's none or if the projects
+        database needs a full update.
+        """
+        try:
+            rows = self._query('SELECT token FROM sync_tokens WHERE backend = ?', (backend,))
+        except OutdatedProjectsDbException:
+            return None
 
-        return found_list
+        return json.loads(rows[0][0]) if rows else None
 
-    def get(self, id, backend=None):
-        id = str(id)
+    def update(self, projects, sync_tokens=None):
+        """
+        Replace the projects of the database by the given `projects`.
+        `sync_tokens` is a dictionary mapping backend names to the token
+        to use at their next incremental update.
+        """
+        lpdb = LocalProjectsDb(projects, sync_tokens)
+        # Write the new database to a temporary file first so that the current database stays usable if anything goes
+        # wrong
+        fd, temp_database_file = tempfile.mkstemp(dir=self.path, prefix='projects', suffix='.sqlite')
+        os.close(fd)
 
-        if self._projects_by_id_cache is None:
-            projects = self.get_projects()
-            self._projects_by_id_cache = defaultdict(list)
+        try:
+            connection = sqlite3.connect(temp_database_file)
 
-            for project in projects:
-                self._projects_by_id_cache[project.id].append(project)
+            try:
+                with connection:
+                    connection.executescript(self.SCHEMA)
+                    self._insert_projects(connection, lpdb.projects, 1)
+                    connection.executemany(
+                        'INSERT INTO sync_tokens (backend, token) VALUES (?, ?)',
+                        [(backend, json.dumps(token)) for backend, token in lpdb.sync_tokens.items()]
+                    )
+                    connection.execute('PRAGMA user_version = %d' % self.SCHEMA_VERSION)
+            finally:
+                connection.close()
+
+            with self._lock:
+                if self._connection is not None:
+                    self._connection.close()
+                    self._connection = None
+
+                os.replace(temp_database_file, self.projects_database_file)
+                self._projects_by_position = {}
+                self._projects_cache = None
+        except BaseException:
+            os.unlink(temp_database_file)
+            raise
+
+    def apply_deltas(self, deltas, sync_tokens, backends):
+        """
+        Apply the changes returned by the backends to the projects database in a single transaction, without
+        rewriting the whole database like :meth:`update` does. The database should exist and be up to date.
+
+        `deltas` is a dictionary mapping backend names to `(changed_projects, removed_projects_ids)` tuples. The
+        changed projects replace the projects of the backend with the same id, or are added if there's none, and the
+        projects whose id is in `removed_projects_ids` are removed. Projects of the backends that are not in `deltas`
+        are left unchanged, unless the backend is not in the `backends` list, in which case they're removed.
+        `sync_tokens` is a dictionary mapping backend names to the token to use at their next incremental update.
+        """
+        backends_placeholders = ', '.join('?' * len(backends))
 
-        for project in self._projects_by_id_cache.get(id, []):
-            if backend is None or project.backend == backend:
-                return project
+        with self._lock:
+            connection = self._get_connection()
 
-        return None
+            with connection:
+                self._delete_projects(connection, 'backend NOT IN (%s)' % backends_placeholders, backends)
+                connection.execute(
+                    'DELETE FROM sync_tokens WHERE backend NOT IN (%s)' % backends_placeholders, backends
+                )
+
+                for backend, (changed_projects, removed_projects_ids) in deltas.items():
+                    for project_id in [project.id for project in changed_projects] + list(removed_projects_ids):
+                        self._delete_projects(connection, 'id = ? AND backend = ?', (str(project_id), backend))
+
+                    last_position = connection.execute('SELECT MAX(position) FROM projects').fetchone()[0] or 0
+                    self._insert_projects(connection, changed_projects, last_position + 1)
+
+                connection.executemany(
+                    'INSERT OR REPLACE INTO sync_tokens (backend, token) VALUES (?, ?)',
+                    [(backend, json.dumps(token)) for backend, token in sync_tokens.items()]
+                )
+
+            self._projects_by_position = {}
+            self._projects_cache = None
+
+    def _insert_projects(self, connection, projects, first_position):
+        """
+        Insert the given `projects` with their activities and aliases, at consecutive positions starting from
+        `first_position`.
+        """
+        lpdb = LocalProjectsDb()
+        positioned_projects = list(enumerate(projects, start=first_position))
+
+        connection.executemany(
+            'INSERT INTO projects (position, backend, id, name, status, start_date, end_date, data)'
+            ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [
+                (
+                    position, project.backend, str(project.id), project.name, project.status,
+                    project.start_date.isoformat() if project.start_date else None,
+                    project.end_date.isoformat() if project.end_date else None,
+                    json.dumps(lpdb.dump_project(project))
+                )
+                for position, project in positioned_projects
+            ]
+        )
+        connection.executemany(
+            'INSERT INTO search_trigrams (trigram, position) VALUES (?, ?)',
+            [
+                (trigram, position)
+                for position, project in positioned_projects
+                for trigram in get_trigrams(project.name.lower() if project.name else '')
+            ]
+        )
+        connection.executemany(
+            'INSERT INTO activities (backend, project_id, id, name, active) VALUES (?, ?, ?, ?, ?)',
+            [
+                (project.backend, str(project.id), str(activity.id), activity.name, activity.is_active())
+                for position, project in positioned_projects
+                for activity in project.activities
+            ]
+        )
+        connection.executemany(
+            'INSERT INTO aliases (alias, backend, project_id, activity_id) VALUES (?, ?, ?, ?)',
+            [
+                (alias, project.backend, str(project.id), str(activity_id))
+                for position, project in positioned_projects
+                for alias, activity_id in project.aliases.items()
+            ]
+        )
+
+    def _delete_projects(self, connection, condition, params):
+        """
+        Delete the projects matching the given SQL `condition` on the projects table, with their activities and
+        aliases.
+        """
+        rows = connection.execute(
+            'SELECT position, backend, id, name FROM projects WHERE %s' % condition, params
+        ).fetchall()
+
+        # The search trigrams are indexed by trigram, so compute them again to delete them without a full scan
+        connection.executemany(
+            'DELETE FROM search_trigrams WHERE trigram = ? AND position = ?',
+            [
+                (trigram, position)
+                for position, backend, id, name in rows
+                for trigram in get_trigrams(name.lower() if name else '')
+            ]
+        )
+        connection.executemany(
+            'DELETE FROM activities WHERE project_id = ? AND backend IS ?',
+            [(id, backend) for position, backend, id, name in rows]
+        )
+        connection.executemany(
+            'DELETE FROM aliases WHERE project_id = ? AND backend IS ?',
+            [(id, backend) for position, backend, id, name in rows]
+        )
+        connection.executemany(
+            'DELETE FROM projects WHERE position = ?', [(position,) for position, backend, id, name in rows]
+        )
+
+    def search(self, search, active_only=False, backend=None):
+        """
+        Return the projects matching all the terms of `search`. A project matches a term if its name contains it or if
+        its id is equal to it. Projects are ranked by how well they match (exact id or name match first, then names
+        starting with the terms, then names containing words starting with the terms), and then by their order in the
+        database.
+        """
+        terms = [s.lower() for s in search]
+        conditions = []
+        params = []
+
+        for term in terms:
+            trigrams = get_trigrams(term)
+
+            # Only consider the projects that have all the trigrams of the term in their name. Terms that are too short
+            # to have trigrams are looked for in all the names
+            if trigrams:
+                trigrams_query = ' INTERSECT '.join(
+                    ['SELECT position FROM search_trigrams WHERE trigram = ?'] * len(trigrams)
+                )
+                conditions.append('position IN (%s UNION SELECT position FROM projects WHERE id = ?)' % trigrams_query)
+                params.extend(trigrams)
+                params.append(term)
+            else:
+                conditions.append('(instr(unicode_lower(name), ?) > 0 OR id = ?)')
+                params.extend([term, term])
+
+        if backend is not None:
+            conditions.append('backend = ?')
+            params.append(backend)
+
+        if active_only:
+            conditions.append('status = ?')
+            params.append(Project.STATUS_ACTIVE)
+
+        rows = self._query(
+            'SELECT position, id, name, data FROM projects %s ORDER BY position' % (
+                ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+            ),
+            params
+        )
+        ranked_rows = []
+
+        for position, id, name, data in rows:
+            rank = get_search_rank(terms, id, name.lower() if name else '')
+
+            if rank is not None:
+                ranked_rows.append((rank, position, data))
+
+        projects = [self._load_project(position, data) for rank, position, data in sorted(ranked_rows)]
+
+        return [project for project in projects if not active_only or project.is_active()]
+
+    def get(self, id, backend=None):
+        if backend is None:
+            rows = self._query('SELECT position, data FROM projects WHERE id = ? ORDER BY position LIMIT 1', (str(id),))
+        else:
+            rows = self._query(
+                'SELECT position, data FROM projects WHERE id = ? AND backend = ? ORDER BY position LIMIT 1',
+                (str(id), backend)
+            )
+
+        return self._load_project(*rows[0]) if rows else None
 
     def mapping_to_project(self, mapping):
         project = self.get(mapping.mapping[0], mapping.backend)
@@ -225,26 +531,110 @@ class ProjectsDb:
 
         return (project, activity)
 
+    def get_mapping_summary(self, mapping):
+        """
+        Same as :meth:`mapping_to_project` but only read what's needed to show the mapping from the projects database,
+        without loading the whole project. The returned project only has its id, name, status, dates and backend set,
+        and its activities only contain the returned activity.
+        """
+        project_id, activity_id = mapping.mapping[:2]
+        backend_condition = ' AND backend = ?' if mapping.backend is not None else ''
+        backend_params = (mapping.backend,) if mapping.backend is not None else ()
+
+        rows = self._query(
+            'SELECT name, status, start_date, end_date, backend FROM projects WHERE id = ?%s'
+            ' ORDER BY position LIMIT 1' % backend_condition,
+            (str(project_id),) + backend_params
+        )
+
+        if not rows:
+            return (None, None)
+
+        name, status, start_date, end_date, backend = rows[0]
+        project = Project(str(project_id), name, status)
+        project.start_date = datetime.date.fromisoformat(start_date) if start_date else None
+        project.end_date = datetime.date.fromisoformat(end_date) if end_date else None
+        project.backend = backend
+
+        rows = self._query(
+            'SELECT name, active FROM activities WHERE project_id = ? AND id = ? AND backend IS ? LIMIT 1',
+            (str(project_id), str(activity_id), backend)
+        ) if activity_id is not None else []
+
+        if not rows:
+            return (project, None)
+
+        activity = Activity(str(activity_id), rows[0][0], bool(rows[0][1]))
+        project.add_activity(activity)
+
+        return (project, activity)
+
+    def get_alias(self, alias):
+        """
+        Return the :class:`~taxi.aliases.Mapping` of the given shared `alias`, or `None` if no project defines it.
+        """
+        rows = self._query(
+            'SELECT project_id, activity_id, backend FROM aliases WHERE alias = ? ORDER BY position DESC LIMIT 1',
+            (alias,)
+        )
+
+        return Mapping(mapping=rows[0][:2], backend=rows[0][2]) if rows else None
+
     def get_aliases(self):
         return {
-            alias: Mapping(mapping=(str(project.id), str(activity_id)), backend=project.backend)
-            for project in self.get_projects()
-            for alias, activity_id in project.aliases.items()
+            alias: Mapping(mapping=(project_id, activity_id), backend=backend)
+            for alias, project_id, activity_id, backend in self._query(
+                'SELECT alias, project_id, activity_id, backend FROM aliases ORDER BY position'
+            )
         }
 
 
+def get_trigrams(text):
+    """
+    Return the set of the sequences of 3 consecutive characters of `text`.
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def get_search_rank(terms, project_id, project_name):
+    """
+    Return the rank of the project with the given id and lowercased name for the given lowercased search `terms`, lower
+    being better, or `None` if the project doesn't match all the terms.
+    """
+    rank = 0
+
+    for term in terms:
+        if term == project_id or term == project_name:
+            continue
+
+        term_position = project_name.find(term)
+
+        if term_position == 0:
+            rank += 1
+        elif term_position > 0 and not project_name[term_position - 1].isalnum():
+            rank += 2
+        elif term_position > 0:
+            rank += 3
+        else:
+            return None
+
+    return rank
+
+
 class LocalProjectsDb:
     VERSION = 2
 
-    def __init__(self, projects=None):
+    def __init__(self, projects=None, sync_tokens=None):
         if not projects:
             projects = []
 
         self.projects = projects
+        self.sync_tokens = sync_tokens or {}
 
     def get_dump_object(self):
         return {
             'VERSION': self.VERSION,
+            'sync_tokens': self.sync_tokens,
             'projects': [
                 self.dump_project(project) for project in self.projects
             ]
@@ -263,29 +653,35 @@ class LocalProjectsDb:
 
         return project_dict
 
+    @classmethod
+    def load_project(cls, project_dict):
+        """
+        Return the :class:`Project` object described by `project_dict`, as
+        returned by :meth:`dump_project`.
+        """
+        project_dict['activities'] = [
+            Activity(str(activity['id']), activity['name'], activity.get('_active', True))
+            for activity in project_dict['activities']
+        ]
+        project_dict['id'] = str(project_dict['id'])
+        for date_type in ['start_date', 'end_date']:
+            if project_dict[date_type] is not None:
+                project_dict[date_type] = datetime.datetime.strptime(
+                    project_dict[date_type], '%Y-%m-%d').date()
+
+        project = Project(project_dict['id'], project_dict['name'])
+        project.__dict__.update(project_dict)
+
+        return project
+
 
 class LocalProjectsDbDecoder(json.JSONDecoder):
     def decode(self, s):
         s = super(LocalProjectsDbDecoder, self).decode(s)
 
-        projects = s['projects']
-        projects_copy = []
-        for project in projects:
-            project['activities'] = [
-                Activity(str(activity['id']), activity['name'], activity.get('_active', True))
-                for activity in project['activities']
-            ]
-            project['id'] = str(project['id'])
-            for date_type in ['start_date', 'end_date']:
-                if project[date_type] is not None:
-                    project[date_type] = datetime.datetime.strptime(
-                        project[date_type], '%Y-%m-%d').date()
-
-            p_copy = Project(project['id'], project['name'])
-            p_copy.__dict__.update(project)
-            projects_copy.append(p_copy)
-
-        lpdb = LocalProjectsDb(projects_copy)
+        lpdb = LocalProjectsDb(
+            [LocalProjectsDb.load_project(project) for project in s['projects']], s.get('sync_tokens')
+        )
         lpdb.VERSION = s['VERSION']
 
         return lpdb
@@ -90,6 +90,7 @@ class Settings(object):
             'editor': StringSetting(),
             'regroup_entries': BooleanSetting(default=True),
             'round_entries': IntegerSetting(default=15),
+            'push_workers': IntegerSetting(default=1),
         },
         'flags': {
             'ignored': StringSetting(default='?'),
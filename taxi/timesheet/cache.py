@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+from .. import __version__
+
+logger = logging.getLogger(__name__)
+
+
+class TimesheetsCache(object):
+    """
+    On-disk cache of parsed timesheets. The parsed lines of each timesheet file are stored in a separate file in the
+    cache directory, along with a key made of the timesheet file modification time and size, and of the parser settings.
+    Cached lines are only used if the key still matches, so that any change to the timesheet file (or to the parser
+    settings) invalidates its cache entry. Cache files are named after the timesheet file path only, so the cache of a
+    timesheet that changed replaces its previous cache instead of adding a new file.
+    """
+    # Increase this when the structure of the parsed lines changes so that existing cache files get ignored
+    VERSION = 3
+
+    def __init__(self, path):
+        self.path = path
+
+    def get_cache_file_path(self, file_path):
+        """
+        Return the path to the file that holds the cache for the timesheet located in `file_path`.
+        """
+        file_hash = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+
+        return os.path.join(self.path, file_hash + '.pickle')
+
+    def get_key(self, file_path, file_stat, parser):
+        """
+        Return the key identifying the version of the timesheet located in `file_path` described by `file_stat` (as
+        returned by :func:`os.stat`) when parsed with the given `parser`.
+        """
+        return (
+            self.VERSION,
+            __version__,
+            os.path.abspath(file_path),
+            file_stat.st_mtime_ns,
+            file_stat.st_size,
+            parser.date_format,
+            tuple(sorted(parser.flags_repr.items())),
+        )
+
+    def get(self, file_path, key):
+        """
+        Return the cached parsed lines of the timesheet located in `file_path`, or `None` if there's no cache entry for
+        it or if the cache entry doesn't match the given `key`.
+        """
+        try:
+            with open(self.get_cache_file_path(file_path), 'rb') as cache_file:
+                cached_key, lines = pickle.load(cache_file)
+        # A corrupt or outdated cache file shouldn't prevent the timesheet from being loaded, so just consider this as a
+        # cache miss
+        except Exception:
+            return None
+
+        return lines if cached_key == key else None
+
+    def set(self, file_path, key, lines):
+        """
+        Store the given parsed `lines` as the cache for the timesheet located in `file_path`. Errors are logged and
+        otherwise ignored since they shouldn't prevent the timesheet from being used.
+        """
+        temp_cache_file = None
+
+        try:
+            os.makedirs(self.path, exist_ok=True)
+
+            with tempfile.NamedTemporaryFile(mode='wb', dir=self.path, prefix='taxi', delete=False) as temp_cache_file:
+                pickle.dump((key, lines), temp_cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temp_cache_file.name, self.get_cache_file_path(file_path))
+        except Exception:
+            logger.exception("Could not write cache for timesheet %s", file_path)
+
+            if temp_cache_file is not None and os.path.exists(temp_cache_file.name):
+                os.unlink(temp_cache_file.name)
+
+    def parse(self, file_path, timesheet_file, parser):
+        """
+        Return the parsed lines of the timesheet located in `file_path`, for which `timesheet_file` is the opened file
+        object. The lines are taken from the cache if the file hasn't changed since it was cached, otherwise the file is
+        parsed with the given `parser` and the result is cached.
+        """
+        key = self.get_key(file_path, os.fstat(timesheet_file.fileno()), parser)
+        lines = self.get(file_path, key)
+
+        if lines is None:
+            lines = list(parser.iter_parse(timesheet_file))
+            self.set(file_path, key, lines)
+
+        return lines
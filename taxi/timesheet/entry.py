@@ -1,6 +1,8 @@
+import bisect
 import collections
-import copy
 import datetime
+import itertools
+import operator
 
 from ..aliases import aliases_database
 from ..exceptions import EntriesCollectionValidationError
@@ -22,13 +24,35 @@ def synchronized(func):
     return wrapper
 
 
+def tracked_attribute(name):
+    """
+    Return a property storing its value in the `_<name>` attribute and
+    calling :meth:`Entry.attribute_changed` when it's set.
+    """
+    def setter(self, value):
+        setattr(self, '_' + name, value)
+        self.attribute_changed(name)
+
+    return property(operator.attrgetter('_' + name), setter)
+
+
 class Entry(FlaggableMixin):
     """
     The Entry is a line representing a timesheet entry, with an alias, a
     duration, a description and some potential flags.
     """
+    __slots__ = (
+        '_text', '_alias', '_duration', '_description', '_changed_attrs', '_hours_cache', '_hash_cache',
+        'previous_entry', 'next_entry', 'push_error'
+    )
+
     FLAG_IGNORED = 'ignored'
     FLAG_PUSHED = 'pushed'
+    FLAGS = (FLAG_IGNORED, FLAG_PUSHED)
+
+    alias = tracked_attribute('alias')
+    duration = tracked_attribute('duration')
+    description = tracked_attribute('description')
 
     def __init__(self, alias, duration, description, flags=None, text=None):
         """
@@ -46,20 +70,21 @@ class Entry(FlaggableMixin):
         """
         super(Entry, self).__init__()
 
+        # Attributes that have been changed since the entry was created. Most entries never change so they all share
+        # the same empty frozenset, which gets replaced when an attribute changes
+        self._changed_attrs = frozenset()
+        self._hours_cache = None
+        self._hash_cache = None
         self._text = text
-        self.alias = alias
-        self.duration = duration
-        self.description = description
+        self._alias = alias
+        self._duration = duration
+        self._description = description
         self.previous_entry = None
 
         # Flags *must* be changed through the dedicated methods, or we won't notice it and we won't be able to reflect
         # the change when outputting the line as text
         if flags is not None:
-            self._flags = copy.copy(flags)
-
-        # This must come last in the initialization as any attribute set after this one will be recorded in
-        # `_changed_attrs`
-        self._changed_attrs = set()
+            self._flags = self.flags_to_bitmask(flags)
 
     def __repr__(self):
         return '<Entry: "%s">' % self.__str__()
@@ -67,15 +92,14 @@ class Entry(FlaggableMixin):
     def __str__(self):
         return "{alias} {time} {description}".format(alias=self.alias, time=self.hours, description=self.description)
 
-    def __setattr__(self, attr, value):
+    def attribute_changed(self, name):
         """
-        Set the given `attr` to the given `value` and memorize this attribute
-        has changed so we can regenerate it when outputting text.
+        Memorize the attribute `name` has changed so we can regenerate it when outputting text, and clear the values
+        computed from the entry attributes.
         """
-        if hasattr(self, '_changed_attrs') and attr != '_changed_attrs':
-            self._changed_attrs.add(attr)
-
-        super(Entry, self).__setattr__(attr, value)
+        self._changed_attrs = self._changed_attrs | {name}
+        self._hours_cache = None
+        self._hash_cache = None
 
     @property
     def hours(self):
@@ -84,6 +108,18 @@ class Entry(FlaggableMixin):
         the difference between the two times will be calculated. If the duration is a number, it will be returned
         as-is.
         """
+        # The number of hours also depends on the previous entry if the entry doesn't have a start time, so the cached
+        # value is only valid if the previous entry and its duration haven't changed
+        previous_entry = self.previous_entry
+        previous_duration = previous_entry.duration if previous_entry is not None else None
+
+        if (self._hours_cache is None or self._hours_cache[0] is not previous_entry
+                or self._hours_cache[1] is not previous_duration):
+            self._hours_cache = (previous_entry, previous_duration, self._get_hours())
+
+        return self._hours_cache[2]
+
+    def _get_hours(self):
         if not isinstance(self.duration, tuple):
             return self.duration
 
@@ -97,19 +133,13 @@ class Entry(FlaggableMixin):
         if time_start is None:
             return 0
 
-        now = datetime.datetime.now()
-        time_start = now.replace(
-            hour=time_start.hour,
-            minute=time_start.minute, second=0
+        total_minutes = (
+            (self.duration[1].hour * 60 + self.duration[1].minute) - (time_start.hour * 60 + time_start.minute)
         )
-        time_end = now.replace(
-            hour=self.duration[1].hour,
-            minute=self.duration[1].minute, second=0
-        )
-        total_time = time_end - time_start
-        total_hours = total_time.seconds / 3600.0
+        # Entries ending before they start are considered to end on the next day
+        total_seconds = (total_minutes * 60) % (24 * 60 * 60)
 
-        return total_hours
+        return total_seconds / 3600.0
 
     @property
     def in_progress(self):
@@ -146,12 +176,17 @@ class Entry(FlaggableMixin):
         Return a value that's used to uniquely identify an entry in a date so we can regroup all entries that share the
         same hash.
         """
-        return u''.join([
-            self.alias,
-            self.description,
-            str(self.ignored),
-            str(self.flags),
-        ])
+        ignored = self.ignored
+
+        if self._hash_cache is None or self._hash_cache[0] != ignored:
+            self._hash_cache = (ignored, u''.join([
+                self.alias,
+                self.description,
+                str(ignored),
+                str(self._flags),
+            ]))
+
+        return self._hash_cache[1]
 
     def add_flag(self, flag):
         """
@@ -159,7 +194,7 @@ class Entry(FlaggableMixin):
         regenerate it when outputting text.
         """
         super(Entry, self).add_flag(flag)
-        self._changed_attrs.add('flags')
+        self.attribute_changed('flags')
 
     def remove_flag(self, flag):
         """
@@ -167,7 +202,7 @@ class Entry(FlaggableMixin):
         can regenerate it when outputting text.
         """
         super(Entry, self).remove_flag(flag)
-        self._changed_attrs.add('flags')
+        self.attribute_changed('flags')
 
     @property
     def flags(self):
@@ -178,7 +213,7 @@ class Entry(FlaggableMixin):
         :meth:`add_flag` or :meth:`remove_flag` or use shortcut properties such
         as :attr:`ignored` or :attr:`pushed`.
         """
-        return copy.copy(self._flags)
+        return self.bitmask_to_flags(self._flags)
 
     @property
     def pushed(self):
@@ -230,11 +265,25 @@ class EntriesCollection(collections.defaultdict):
     of automatically synchronizing the textual representation with the
     structured data.
     """
-    def __init__(self, parser, entries=None):
+    def __init__(self, parser, entries=None, lines=None):
+        """
+        Create an entries collection that uses the given `parser` for its textual representation. If `entries` is set,
+        it can either be a string or a file object (or any iterable of text lines) to initialize the collection from.
+        If `lines` is set, it must be a list of already parsed lines to initialize the collection from.
+        """
         super(EntriesCollection, self).__init__(EntriesList)
 
         self.lines = []
         self.parser = parser
+        # Last line of each date in `lines`, ie. the line after which new
+        # entries of this date are inserted, with its last known position
+        self._dates_last_line = {}
+        # Dates of the collection, kept sorted to allow range queries, and
+        # the order in which they were added to the collection. The index is
+        # set to `None` when it needs to be rebuilt
+        self._sorted_dates = []
+        self._dates_order = {}
+        self._dates_counter = itertools.count()
         # This flag allows to enable/disable synchronization with the internal
         # text representation, useful when building the initial structure from
         # the text representation
@@ -242,11 +291,16 @@ class EntriesCollection(collections.defaultdict):
 
         # If there are initial entries to import, disable synchronization and
         # import them in the structure
-        if entries:
+        if entries or lines:
             self.synchronized = False
 
             try:
-                self.init_from_str(entries)
+                if lines:
+                    self.init_from_lines(lines)
+                elif isinstance(entries, str):
+                    self.init_from_str(entries)
+                else:
+                    self.init_from_file(entries)
             finally:
                 self.synchronized = True
 
@@ -276,6 +330,41 @@ class EntriesCollection(collections.defaultdict):
 
         super(EntriesCollection, self).__delitem__(key)
 
+        if self._sorted_dates is not None:
+            position = bisect.bisect_left(self._sorted_dates, key)
+            if position < len(self._sorted_dates) and self._sorted_dates[position] == key:
+                del self._sorted_dates[position]
+            self._dates_order.pop(key, None)
+
+    def _invalidate_dates_index(self):
+        """
+        Discard the sorted dates index. This is needed when the collection is
+        changed through dict methods that don't use :meth:`__setitem__` or
+        :meth:`__delitem__`.
+        """
+        self._sorted_dates = None
+        self._dates_order = None
+
+    def pop(self, *args, **kwargs):
+        self._invalidate_dates_index()
+        return super(EntriesCollection, self).pop(*args, **kwargs)
+
+    def popitem(self):
+        self._invalidate_dates_index()
+        return super(EntriesCollection, self).popitem()
+
+    def clear(self):
+        self._invalidate_dates_index()
+        super(EntriesCollection, self).clear()
+
+    def update(self, *args, **kwargs):
+        self._invalidate_dates_index()
+        super(EntriesCollection, self).update(*args, **kwargs)
+
+    def setdefault(self, *args, **kwargs):
+        self._invalidate_dates_index()
+        return super(EntriesCollection, self).setdefault(*args, **kwargs)
+
     def __setitem__(self, key, value):
         """
         If in synchronized mode, add the date and the entries to the
@@ -292,6 +381,10 @@ class EntriesCollection(collections.defaultdict):
 
         super(EntriesCollection, self).__setitem__(key, value)
 
+        if self._sorted_dates is not None:
+            bisect.insort(self._sorted_dates, key)
+            self._dates_order[key] = next(self._dates_counter)
+
         if self.synchronized:
             self.add_date(key)
             for entry in value:
@@ -315,6 +408,36 @@ class EntriesCollection(collections.defaultdict):
         """
         Add the given entry to the textual representation.
         """
+        insert_at = self.get_entry_insert_position(date)
+        self.lines.insert(insert_at + 1, entry)
+
+        # If there's no other Entry in the current date, add a blank line
+        # between the date and the entry
+        if not isinstance(self.lines[insert_at], Entry):
+            self.lines.insert(insert_at + 1, TextLine(''))
+            insert_at += 1
+
+        self._dates_last_line[date] = (entry, insert_at + 1)
+
+    def get_entry_insert_position(self, date):
+        """
+        Return the position of the line after which a new entry for the
+        given date should be inserted, ie. the last entry of the date, or the
+        date line if the date doesn't have any entry yet.
+        """
+        # Try to use the last known position of the last line of the date
+        # before falling back to scanning all the lines
+        if date in self._dates_last_line:
+            last_line, lineno = self._dates_last_line[date]
+
+            if lineno < len(self.lines) and self.lines[lineno] is last_line:
+                return lineno
+
+            try:
+                return self.lines.index(last_line)
+            except ValueError:
+                pass
+
         in_date = False
         insert_at = 0
 
@@ -332,12 +455,7 @@ class EntriesCollection(collections.defaultdict):
                 elif isinstance(line, DateLine):
                     break
 
-        self.lines.insert(insert_at + 1, entry)
-
-        # If there's no other Entry in the current date, add a blank line
-        # between the date and the entry
-        if not isinstance(self.lines[insert_at], Entry):
-            self.lines.insert(insert_at + 1, TextLine(''))
+        return insert_at
 
     def delete_entry(self, entry):
         """
@@ -350,10 +468,15 @@ class EntriesCollection(collections.defaultdict):
         """
         Remove the given entries from the textual representation.
         """
+        # Entries are compared by identity, using a set so that removing a lot
+        # of entries doesn't need to go through all of them for each line
+        entries_ids = {id(entry) for entry in entries}
+
         self.lines = trim([
             line for line in self.lines
-            if not isinstance(line, Entry) or line not in entries
+            if id(line) not in entries_ids
         ])
+        self._dates_last_line = {}
 
     def add(self, date, entry):
         self[date].append(entry)
@@ -370,6 +493,7 @@ class EntriesCollection(collections.defaultdict):
         ]
 
         self.lines = trim(self.lines)
+        self._dates_last_line = {}
 
     @synchronized
     def add_date(self, date):
@@ -378,6 +502,12 @@ class EntriesCollection(collections.defaultdict):
         """
         self.lines = self.parser.add_date(date, self.lines)
 
+        # The date is added either at the top or at the bottom of the lines
+        for lineno in (len(self.lines) - 1, 0):
+            if isinstance(self.lines[lineno], DateLine) and self.lines[lineno].date == date:
+                self._dates_last_line[date] = (self.lines[lineno], lineno)
+                break
+
     def init_from_str(self, entries):
         """
         Initialize the structured and textual data based on a string
@@ -385,13 +515,47 @@ class EntriesCollection(collections.defaultdict):
         this string, refer to the
         :func:`~taxi.timesheet.parser.parse_text` function.
         """
-        self.lines = self.parser.parse_text(entries)
+        self.init_from_file(entries.splitlines())
+
+    def init_from_file(self, fileobj):
+        """
+        Initialize the structured and textual data based on the lines read
+        from `fileobj`, which can be a file object or any iterable of text
+        lines. The lines are parsed one by one with
+        :func:`~taxi.timesheet.parser.iter_parse` so the whole file doesn't
+        need to be read in memory first.
+        """
+        self.init_from_lines(self.parser.iter_parse(fileobj))
+
+    def init_from_lines(self, lines):
+        """
+        Initialize the structured and textual data based on the given
+        already parsed `lines`, as returned by
+        :func:`~taxi.timesheet.parser.iter_parse`.
+        """
+        self.lines = []
+        self._dates_last_line = {}
+        # New entries are added to the first block of a date if it's defined
+        # more than once, unless the blocks directly follow each other
+        in_first_date_block = False
+        current_date = None
+
+        for lineno, line in enumerate(lines, 1):
+            self.lines.append(line)
 
-        for lineno, line in enumerate(self.lines, 1):
             if isinstance(line, DateLine):
+                in_first_date_block = line.date not in self._dates_last_line or (
+                    in_first_date_block and line.date == current_date
+                )
                 current_date = line.date
                 self[current_date] = self.default_factory(self, line.date)
+
+                if in_first_date_block:
+                    self._dates_last_line[current_date] = (line, lineno - 1)
             elif isinstance(line, Entry):
+                if in_first_date_block:
+                    self._dates_last_line[current_date] = (line, lineno - 1)
+
                 if len(self[current_date]) > 0:
                     line.previous_entry = self[current_date][-1]
                     self[current_date][-1].next_entry = line
@@ -416,6 +580,24 @@ class EntriesCollection(collections.defaultdict):
         """
         return [self.parser.to_text(line) for line in self.lines]
 
+    def get_dates_in_range(self, date_from=None, date_to=None):
+        """
+        Return the dates of the collection that are between `date_from` and
+        `date_to` (both included), in the order they were added to the
+        collection. Any of `date_from` or `date_to` can be `None` to leave
+        the range open.
+        """
+        if self._sorted_dates is None:
+            self._sorted_dates = sorted(self.keys())
+            self._dates_order = {key: next(self._dates_counter) for key in self.keys()}
+
+        start = bisect.bisect_left(self._sorted_dates, date_from) if date_from is not None else 0
+        end = (bisect.bisect_right(self._sorted_dates, date_to)
+               if date_to is not None
+               else len(self._sorted_dates))
+
+        return sorted(self._sorted_dates[start:end], key=self._dates_order.__getitem__)
+
     def filter(self, date=None, regroup=False, ignored=None, pushed=None, unmapped=None, current_workday=None):
         """
         Return the entries as a dict of {:class:`datetime.date`: :class:`~taxi.timesheet.lines.Entry`}
@@ -454,13 +636,10 @@ class EntriesCollection(collections.defaultdict):
             date = (date, date)
 
         filtered_entries = collections.defaultdict(list)
+        dates = self.keys() if date is None else self.get_dates_in_range(*date)
 
-        for (entries_date, entries) in self.items():
-            if (date is not None and (
-                    (date[0] is not None and entries_date < date[0])
-                    or (date[1] is not None and entries_date > date[1]))):
-                continue
-
+        for entries_date in dates:
+            entries = self[entries_date]
             entries_for_date = []
 
             if regroup:
@@ -534,11 +713,14 @@ class EntriesList(list):
 
     def __delitem__(self, key):
         """
-        Delete the given element from the list and synchronize the textual
-        representation.
+        Delete the given element (or elements if `key` is a slice) from the
+        list and synchronize the textual representation.
         """
         if self.entries_collection is not None:
-            self.entries_collection.delete_entry(self[key])
+            if isinstance(key, slice):
+                self.entries_collection.delete_entries(self[key])
+            else:
+                self.entries_collection.delete_entry(self[key])
 
         super(EntriesList, self).__delitem__(key)
 
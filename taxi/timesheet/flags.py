@@ -1,34 +1,78 @@
 class FlaggableMixin(object):
     """
-    A `FlaggableMixin` instance has a :class:`set` of flags that should be
+    A `FlaggableMixin` instance has a set of flags that should be
     changed with the :meth:`add_flag` and :meth:`remove_flag` methods::
 
         >>> my_flaggable_object.add_flag('ignored')
         >>> my_flaggable_object.has_flag('ignored')
         True
+
+    The supported flags are listed in :attr:`FLAGS`. They are stored as a
+    bitmask, each flag using the bit matching its position in :attr:`FLAGS`.
     """
+    __slots__ = ('_flags',)
+
+    FLAGS = ()
 
     def __init__(self, *args, **kwargs):
-        self._flags = set()
+        self._flags = 0
         super(FlaggableMixin, self).__init__(*args, **kwargs)
 
+    @classmethod
+    def flag_to_bit(cls, flag):
+        """
+        Return the bit used to store the given `flag`. Raise
+        :exc:`ValueError` if the flag is not supported.
+        """
+        try:
+            return 1 << cls.FLAGS.index(flag)
+        except ValueError:
+            raise ValueError("Flag '%s' is not supported" % flag)
+
+    @classmethod
+    def flags_to_bitmask(cls, flags):
+        """
+        Return the bitmask corresponding to the given iterable of `flags`.
+        """
+        bitmask = 0
+
+        for flag in flags:
+            bitmask |= cls.flag_to_bit(flag)
+
+        return bitmask
+
+    @classmethod
+    def bitmask_to_flags(cls, bitmask):
+        """
+        Return the :class:`set` of flags corresponding to the given `bitmask`.
+        """
+        return {flag for position, flag in enumerate(cls.FLAGS) if bitmask & (1 << position)}
+
     def add_flag(self, flag):
         """
         Add the given `flag` to the set of flags.
         """
-        self._flags.add(flag)
+        self._flags |= self.flag_to_bit(flag)
 
     def remove_flag(self, flag):
         """
-        Remove the given `flag` from the set of flags.
+        Remove the given `flag` from the set of flags. Raise :exc:`KeyError`
+        if the flag is not set.
         """
-        self._flags.remove(flag)
+        if not self.has_flag(flag):
+            raise KeyError(flag)
+
+        self._flags &= ~self.flag_to_bit(flag)
 
     def has_flag(self, flag):
         """
-        Return True if the given `flag` is set, False otherwise.
+        Return True if the given `flag` is set, False otherwise (including
+        if the flag is not supported).
         """
-        return flag in self._flags
+        if flag not in self.FLAGS:
+            return False
+
+        return bool(self._flags & self.flag_to_bit(flag))
 
     def _add_or_remove_flag(self, flag, add):
         """
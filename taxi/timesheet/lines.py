@@ -2,6 +2,8 @@ class TextLine(object):
     """
     The TextLine is either a blank line or a comment line.
     """
+    __slots__ = ('text',)
+
     is_text_line = True
 
     def __init__(self, text):
@@ -19,6 +21,8 @@ class DateLine(object):
     """
     Represents a date in a timesheet.
     """
+    __slots__ = ('_text', 'date')
+
     is_date_line = True
 
     def __init__(self, date, text=None):
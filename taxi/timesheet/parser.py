@@ -7,6 +7,10 @@ from .entry import Entry
 from .lines import DateLine, TextLine
 from .utils import is_top_down, trim
 
+# Compiled entry line regexps, indexed by the flags characters they accept. This allows parser instances that use the
+# same flags to share a single compiled pattern
+_entry_line_regexps_cache = {}
+
 
 def create_time_from_text(text):
     """
@@ -88,7 +92,22 @@ class TimesheetParser(object):
         self.flags_repr = flags_repr or self.ENTRY_FLAGS_REPR
         self.add_date_to_bottom = add_date_to_bottom
         self.date_format = date_format
-        self.entry_line_regexp = self.ENTRY_LINE_REGEXP % {'flags_repr': re.escape(''.join(self.flags_repr.values()))}
+        self.entry_line_regexp = self.get_entry_line_regexp(''.join(self.flags_repr.values()))
+
+    @classmethod
+    def get_entry_line_regexp(cls, flags_chars):
+        """
+        Return the compiled :attr:`ENTRY_LINE_REGEXP` accepting the given `flags_chars` as flags. The compiled pattern
+        is cached so that it's only built once for a given set of flags.
+        """
+        cache_key = (cls.ENTRY_LINE_REGEXP, flags_chars)
+
+        if cache_key not in _entry_line_regexps_cache:
+            _entry_line_regexps_cache[cache_key] = re.compile(
+                cls.ENTRY_LINE_REGEXP % {'flags_repr': re.escape(flags_chars)}
+            )
+
+        return _entry_line_regexps_cache[cache_key]
 
     def flags_to_text(self, flags):
         """
@@ -189,7 +208,7 @@ class TimesheetParser(object):
         Try to parse the given text line and extract and entry. Return an :class:`~taxi.timesheet.lines.Entry`
         object if parsing is successful, otherwise raise :exc:`~taxi.exceptions.ParseError`.
         """
-        split_line = re.match(self.entry_line_regexp, text)
+        split_line = self.entry_line_regexp.match(text)
 
         if not split_line:
             raise ParseError("Line must have an alias, a duration and optionally a description")
@@ -262,16 +281,32 @@ class TimesheetParser(object):
         Parse a text in the form dd/mm/yyyy, dd/mm/yy or yyyy/mm/dd and return a corresponding :class:`datetime.date`
         object. If no date can be extracted from the given text, a :exc:`ValueError` will be raised.
         """
+        date_matches = self.match_date(text)
+
+        if date_matches is None:
+            raise ValueError("No date could be extracted from the given value")
+
+        return self.date_from_matches(date_matches)
+
+    def match_date(self, text):
+        """
+        Match the given text against the supported date formats and return the corresponding :class:`re.Match`
+        object, or `None` if the text doesn't start with a date.
+        """
         # Try to match dd/mm/yyyy format
-        date_matches = re.match(self.DATE_LINE_REGEXP, text)
+        date_matches = self.DATE_LINE_REGEXP.match(text)
 
         # If no match, try with yyyy/mm/dd format
         if date_matches is None:
-            date_matches = re.match(self.US_DATE_LINE_REGEXP, text)
+            date_matches = self.US_DATE_LINE_REGEXP.match(text)
 
-        if date_matches is None:
-            raise ValueError("No date could be extracted from the given value")
+        return date_matches
 
+    def date_from_matches(self, date_matches):
+        """
+        Return the :class:`datetime.date` object corresponding to the given `date_matches`, as returned by
+        :meth:`match_date`.
+        """
         # yyyy/mm/dd
         if len(date_matches.group(1)) == 4:
             return datetime.date(int(date_matches.group(1)), int(date_matches.group(2)), int(date_matches.group(3)))
@@ -308,12 +343,40 @@ class TimesheetParser(object):
         :class:`~taxi.timesheet.lines.Entry`, and :class:`~taxi.timesheet.lines.TextLine` objects. If there's an
         error during parsing, a :exc:`taxi.exceptions.ParseError` will be raised.
         """
-        text = text.strip()
-        lines = text.splitlines()
-        parsed_lines = []
+        return list(self.iter_parse(text.splitlines()))
+
+    def iter_parse(self, fileobj):
+        """
+        Parse the lines read from `fileobj` and yield a :class:`~taxi.timesheet.lines.DateLine`,
+        :class:`~taxi.timesheet.lines.Entry`, or :class:`~taxi.timesheet.lines.TextLine` object for each of them.
+        `fileobj` can be a file object or any iterable of text lines. Blank lines at the start and at the end of the
+        file are skipped. If there's an error during parsing, a :exc:`taxi.exceptions.ParseError` will be raised.
+        """
         encountered_date = False
+        lineno = 0
+        # Blank lines are only yielded once we know they're followed by a non-blank line, so that trailing blank lines
+        # are left out without having to read the whole file first
+        pending_blank_lines = []
+
+        for line in fileobj:
+            line = line.rstrip('\r\n')
+
+            if not line.strip():
+                if lineno > 0:
+                    pending_blank_lines.append(line)
+
+                continue
+
+            for blank_line in pending_blank_lines:
+                lineno += 1
+                yield self.parse_line(blank_line)
+
+            pending_blank_lines = []
+            lineno += 1
+
+            if lineno == 1:
+                line = line.lstrip()
 
-        for (lineno, line) in enumerate(lines, 1):
             try:
                 parsed_line = self.parse_line(line)
 
@@ -326,10 +389,8 @@ class TimesheetParser(object):
                 e.line_number = lineno
                 e.line = line
                 raise
-            else:
-                parsed_lines.append(parsed_line)
 
-        return parsed_lines
+            yield parsed_line
 
     def parse_line(self, text):
         """
@@ -341,19 +402,23 @@ class TimesheetParser(object):
         """
         text = text.strip().replace('\t', ' ' * 4)
 
-        # The logic is: if the line starts with a #, consider it's a comment (TextLine), otherwise try to parse it as a
-        # date and if this fails, try to parse it as an entry. If this fails too, the line is not valid
+        # The logic is: if the line starts with a #, consider it's a comment (TextLine), otherwise if it starts with a
+        # date consider it's a date and if it doesn't, try to parse it as an entry. If this fails too, the line is not
+        # valid. Date lines always start with a digit so there's no need to try to match a date otherwise, which is the
+        # case of most entry lines
         if len(text) == 0 or text.startswith('#'):
-            parsed_line = TextLine(text)
-        else:
+            return TextLine(text)
+
+        date_matches = self.match_date(text) if text[0].isdigit() else None
+
+        if date_matches is not None:
             try:
-                date = self.create_date_from_text(text)
+                return DateLine(self.date_from_matches(date_matches), text)
+            # The line starts with something that looks like a date but isn't one (eg. an alias such as `12-31-99_x`)
             except ValueError:
-                parsed_line = self.create_entry_line_from_text(text)
-            else:
-                parsed_line = DateLine(date, text)
+                pass
 
-        return parsed_line
+        return self.create_entry_line_from_text(text)
 
     def add_date(self, date, lines):
         """
@@ -5,7 +5,6 @@ import os
 import re
 import tempfile
 from collections import defaultdict
-from functools import reduce
 
 from ..exceptions import (
     EntriesCollectionValidationError,
@@ -50,26 +49,34 @@ class Timesheet(object):
         return '\n'.join(self.entries.to_lines())
 
     @classmethod
-    def load(cls, file_path, parser=None, initial=''):
+    def load(cls, file_path, parser=None, initial='', cache=None):
         """
         Load the timesheet file located in `file_path`. If `parser` is not set,
         :class:`~taxi.timesheet.parser.TimesheetParser` will be used. If the file doesn't exist, an empty timesheet
         will be returned. If the file exists and its contents are not a valid timesheet,
-        :exc:`~taxi.timesheet.parser.ParseError` will be raised.
+        :exc:`~taxi.timesheet.parser.ParseError` will be raised. If `cache` is set, it must be a
+        :class:`~taxi.timesheet.cache.TimesheetsCache` object that will be used to avoid parsing the file again if it
+        hasn't changed since it was last loaded.
         """
         if not parser:
             parser = TimesheetParser()
 
         try:
-            with codecs.open(file_path, 'r', 'utf-8') as timesheet_file:
-                contents = timesheet_file.read()
+            timesheet_file = codecs.open(file_path, 'r', 'utf-8')
         except IOError:
             if callable(initial):
                 contents = initial()
             else:
                 contents = initial
 
-        entries = EntriesCollection(parser, contents)
+            entries = EntriesCollection(parser, contents)
+        else:
+            # Parse the file line by line instead of reading it all at once, since timesheets can span several years
+            with timesheet_file:
+                if cache is not None:
+                    entries = EntriesCollection(parser, lines=cache.parse(file_path, timesheet_file, parser))
+                else:
+                    entries = EntriesCollection(parser, timesheet_file)
 
         timesheet = cls(entries)
         timesheet.file_path = file_path
@@ -238,13 +245,13 @@ class TimesheetCollection:
         return call
 
     @classmethod
-    def load(cls, file_pattern, nb_previous_files=1, parser=None):
+    def load(cls, file_pattern, nb_previous_files=1, parser=None, cache=None):
         """
         Load a collection of timesheet from the given `file_pattern`. `file_pattern` is a path to a timesheet file that
         will be expanded with :func:`datetime.date.strftime` and the current date. `nb_previous_files` is the number of
         other timesheets to load, depending on `file_pattern` this will result in either the timesheet from the
         previous month or from the previous year to be loaded. If `parser` is not set, a default
-        :class:`taxi.timesheet.parser.TimesheetParser` will be used.
+        :class:`taxi.timesheet.parser.TimesheetParser` will be used. `cache` is passed to :meth:`Timesheet.load`.
         """
         if not parser:
             parser = TimesheetParser()
@@ -255,7 +262,8 @@ class TimesheetCollection:
         for file_path in timesheet_files:
             try:
                 timesheet = Timesheet.load(
-                    file_path, parser=parser, initial=lambda: timesheet_collection.get_new_timesheets_contents()
+                    file_path, parser=parser, initial=lambda: timesheet_collection.get_new_timesheets_contents(),
+                    cache=cache
                 )
             except (ParseError, EntriesCollectionValidationError) as e:
                 e.file = file_path
@@ -354,11 +362,23 @@ class TimesheetCollection:
     def entries(self):
         """
         Return the entries (as a {date: entries} dict) of all timesheets in the
-        collection.
+        collection. The returned :class:`~taxi.timesheet.entry.EntriesCollection`
+        is not synchronized with any textual representation, so changes to its
+        structure (eg. adding or removing entries) won't be reflected in the
+        timesheets.
         """
         entries_list = self._timesheets_callback('entries')()
+        parser = entries_list[0].parser if entries_list else TimesheetParser()
+        merged_entries = EntriesCollection(parser)
+        # Merging the entries without any text synchronization keeps this
+        # linear in the total number of entries
+        merged_entries.synchronized = False
+
+        for entries in entries_list:
+            for entries_date, date_entries in entries.items():
+                merged_entries[entries_date].extend(date_entries)
 
-        return reduce(lambda x, y: x + y, entries_list)
+        return merged_entries
 
     def get_hours(self, **kwargs):
         """
@@ -57,7 +57,6 @@ class BaseUi(object):
     def project_with_activities(self, project, numbered_activities=False):
         self.msg(str(project))
         self.msg("\nActivities:")
-        mappings = aliases_database.get_reversed_aliases()
 
         for (key, activity) in enumerate(project.activities):
             mapping = Mapping(mapping=(project.id, activity.id),
@@ -68,10 +67,12 @@ class BaseUi(object):
             else:
                 activity_number = ''
 
-            if mapping in mappings:
+            mapping_aliases = aliases_database.get_mapping_aliases(mapping)
+
+            if mapping_aliases:
                 self.msg("%s%4s %s (mapped to %s)" % (activity_number,
                          activity.id, activity.name,
-                         mappings[mapping]))
+                         mapping_aliases[-1]))
             else:
                 self.msg('%s%4s %s' % (activity_number, activity.id,
                                        activity.name))
@@ -392,6 +393,10 @@ class BaseUi(object):
     def updating_projects_database(self):
         self.msg("Updating database, this may take some time...")
 
+    def projects_database_update_failed(self, backend_name, error):
+        self.err("Could not fetch projects from backend `%s`: %s. Its projects"
+                 " have been left unchanged." % (backend_name, error))
+
     def projects_database_update_success(self, aliases_after_update,
                                          projects_db):
         """
@@ -411,7 +416,7 @@ class BaseUi(object):
             """
             for alias in aliases:
                 mapping = aliases_after_update[alias]
-                (project, activity) = projects_db.mapping_to_project(mapping)
+                (project, activity) = projects_db.get_mapping_summary(mapping)
 
                 self.msg("%s\n\t%s / %s" % (
                     alias, project.name if project else "?",
@@ -447,7 +452,7 @@ class BaseUi(object):
 
     def show_command_results(self, search, matches, projects_db):
         def mapping_to_activity_name(mapping):
-            activity = projects_db.mapping_to_project(mapping)
+            activity = projects_db.get_mapping_summary(mapping)
             if not activity[0] or not activity[1]:
                 activity_str = "a non-existent activity"
             else:
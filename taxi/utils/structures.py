@@ -1,4 +1,7 @@
 import collections
+import collections.abc
+import difflib
+import heapq
 
 
 class OrderedSet(collections.abc.MutableSet):
@@ -60,3 +63,62 @@ class OrderedSet(collections.abc.MutableSet):
         if isinstance(other, OrderedSet):
             return len(self) == len(other) and list(self) == list(other)
         return set(self) == set(other)
+
+
+class NgramIndex(object):
+    """
+    Index of strings by their n-grams (sequences of `n` consecutive characters), used to quickly find the strings that
+    look like a given string without comparing it to every indexed string.
+    """
+    def __init__(self, strings, n=2):
+        self.n = n
+        self.strings = list(strings)
+        self.postings = collections.defaultdict(list)
+
+        for string in self.strings:
+            for ngram in self.get_ngrams(string):
+                self.postings[ngram].append(string)
+
+    def get_ngrams(self, string):
+        """
+        Return the set of n-grams of `string`. The string is padded so that short strings and the first and last
+        characters of the string also get n-grams.
+        """
+        padding = '\0' * (self.n - 1)
+        string = padding + string + padding
+
+        return {string[i:i + self.n] for i in range(len(string) - self.n + 1)}
+
+    def get_candidates(self, string, max_candidates=None):
+        """
+        Return the indexed strings sharing n-grams with `string`, the ones sharing the most n-grams first, with a
+        maximum of `max_candidates` strings.
+        """
+        counts = collections.Counter()
+
+        for ngram in self.get_ngrams(string):
+            counts.update(self.postings.get(ngram, ()))
+
+        return [candidate for candidate, count in counts.most_common(max_candidates)]
+
+    def get_close_matches(self, string, n=3, cutoff=0.6, max_candidates=100):
+        """
+        Like :func:`difflib.get_close_matches`, but only compare `string` to the `max_candidates` indexed strings that
+        share the most n-grams with it. Strings that don't share any n-gram with `string` (eg. ``ba`` for ``ab``) can
+        still be close enough for low values of `cutoff`, but they're only returned if no indexed string shares an
+        n-gram with `string`, in which case all the indexed strings are compared to it.
+        """
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(string)
+        matches = []
+
+        for candidate in self.get_candidates(string, max_candidates) or self.strings:
+            matcher.set_seq1(candidate)
+
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                ratio = matcher.ratio()
+
+                if ratio >= cutoff:
+                    matches.append((ratio, candidate))
+
+        return [candidate for score, candidate in heapq.nlargest(n, matches)]
@@ -0,0 +1,76 @@
+import os
+import sys
+
+import pytest
+
+from ..generator import DataGenerator
+
+
+def get_setting(name, default):
+    """
+    Return the value of the `TAXI_BENCHMARK_<name>` environment variable, or `default` if it's not set. The value is
+    converted to the type of `default`.
+    """
+    return type(default)(os.environ.get('TAXI_BENCHMARK_' + name, default))
+
+
+class BenchmarkEnvironment:
+    """
+    Generated configuration, projects database and timesheets used to benchmark the taxi commands. The size of the
+    generated data can be set with the `TAXI_BENCHMARK_YEARS`, `TAXI_BENCHMARK_ENTRIES_PER_DAY`,
+    `TAXI_BENCHMARK_ALIASES` and `TAXI_BENCHMARK_PROJECTS` environment variables.
+    """
+    def __init__(self, tmpdir, config, data_dir):
+        self.tmpdir = tmpdir
+        self.config = config
+        self.data_dir = data_dir
+        self.sizes = {
+            'years': get_setting('YEARS', 1.0),
+            'entries_per_day': get_setting('ENTRIES_PER_DAY', 10),
+            'aliases': get_setting('ALIASES', 500),
+            'projects': get_setting('PROJECTS', 2000),
+        }
+
+    def generate(self):
+        generator = DataGenerator(
+            years=self.sizes['years'], entries_per_day=self.sizes['entries_per_day'], nb_aliases=self.sizes['aliases'],
+            nb_projects=self.sizes['projects'], date_format=self.config.config.get('taxi', 'date_format'),
+            pushed_ratio=0.8, comments_ratio=0.1, in_progress=True,
+        )
+        timesheets_path = str(self.tmpdir.join('timesheets'))
+
+        self.config.set_dict(generator.get_config(timesheets_path))
+        generator.write_projects_db(str(self.data_dir))
+        generator.write_timesheets(timesheets_path)
+
+    def get_command(self, args, importtime=False):
+        """
+        Return the command line to run taxi with the given `args`.
+        """
+        return [sys.executable] + (['-X', 'importtime'] if importtime else []) + [
+            '-c', 'from taxi.commands.base import cli; cli()',
+            '--config=%s' % self.config.path, '--taxi-dir=%s' % str(self.data_dir),
+        ] + list(args)
+
+    def get_env(self):
+        """
+        Return the environment variables to run taxi with, so that it doesn't use the user configuration and caches.
+        """
+        env = dict(os.environ)
+        env.update({
+            'HOME': str(self.tmpdir),
+            'XDG_CACHE_HOME': str(self.tmpdir.join('cache')),
+            'XDG_CONFIG_HOME': str(self.tmpdir.join('config')),
+            'XDG_DATA_HOME': str(self.tmpdir.join('share')),
+            'PYTHONPATH': os.pathsep.join(sys.path),
+        })
+
+        return env
+
+
+@pytest.fixture
+def benchmark_env(tmpdir, config, data_dir):
+    benchmark_env = BenchmarkEnvironment(tmpdir, config, data_dir)
+    benchmark_env.generate()
+
+    return benchmark_env
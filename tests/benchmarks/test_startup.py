@@ -0,0 +1,132 @@
+"""
+Startup time benchmarks of the taxi commands. They're only run if the `TAXI_BENCHMARK` environment variable is set::
+
+    TAXI_BENCHMARK=1 pytest -s tests/benchmarks
+
+Each command is run `TAXI_BENCHMARK_RUNS` times (after a first run to fill the caches) and the best wall time is
+compared to the baseline recorded on the same machine. Timings depend on the machine, so the baseline is not part of
+the repository: it's recorded in ``baseline.json`` (ignored by git) the first time the benchmarks are run with a given
+data size, and the benchmark is skipped. The next runs fail if a command is more than `TAXI_BENCHMARK_TOLERANCE` times
+(1.5 by default) slower than the baseline. Run the benchmarks with `TAXI_BENCHMARK_UPDATE_BASELINE` set to record the
+measured times as the new baseline.
+"""
+import json
+import os
+import re
+import subprocess
+import time
+
+import pytest
+
+from .conftest import get_setting
+
+pytestmark = pytest.mark.skipif(not os.environ.get('TAXI_BENCHMARK'), reason="TAXI_BENCHMARK is not set")
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+IMPORTTIME_REGEX = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| *(\S+)$')
+
+COMMANDS = {
+    'version': ['--version'],
+    'current': ['current'],
+    'status': ['status'],
+    'edit': ['edit'],
+}
+
+
+def run(benchmark_env, args, importtime=False):
+    """
+    Run taxi with the given `args` and return its stderr output.
+    """
+    return subprocess.run(
+        benchmark_env.get_command(args, importtime=importtime), env=benchmark_env.get_env(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True, check=True
+    ).stderr
+
+
+def measure_wall_time(benchmark_env, args, nb_runs):
+    """
+    Return the best wall time of `nb_runs` runs of taxi with the given `args`, in milliseconds.
+    """
+    timings = []
+
+    for i in range(nb_runs):
+        start = time.perf_counter()
+        run(benchmark_env, args)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return min(timings)
+
+
+def get_import_times(importtime_output):
+    """
+    Return a list of `(module, self time, cumulative time)` tuples of the modules imported in the given
+    `-X importtime` output, times being in milliseconds.
+    """
+    import_times = []
+
+    for line in importtime_output.splitlines():
+        match = IMPORTTIME_REGEX.match(line)
+
+        if match:
+            import_times.append((match.group(3), int(match.group(1)) / 1000, int(match.group(2)) / 1000))
+
+    return import_times
+
+
+def format_import_times(import_times, limit=15):
+    """
+    Return the `limit` modules that took the most time to import (not counting the modules they import), formatted
+    as a table.
+    """
+    return '\n'.join(
+        '  %-40s %8.1fms %8.1fms' % import_time
+        for import_time in sorted(import_times, key=lambda import_time: import_time[1], reverse=True)[:limit]
+    )
+
+
+def read_baseline():
+    """
+    Return the recorded baseline, as a dict with the generated data sizes as keys and dicts of commands wall times as
+    values.
+    """
+    try:
+        with open(BASELINE_FILE, 'r') as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return {}
+
+
+def write_baseline(baseline):
+    with open(BASELINE_FILE, 'w') as baseline_file:
+        json.dump(baseline, baseline_file, indent=4, sort_keys=True)
+        baseline_file.write('\n')
+
+
+@pytest.mark.parametrize('command', sorted(COMMANDS))
+def test_startup_time(benchmark_env, command):
+    args = COMMANDS[command]
+    # The first run fills the caches (entry points, parsed timesheets) so that the next ones measure the usual case
+    run(benchmark_env, args)
+    wall_time = measure_wall_time(benchmark_env, args, get_setting('RUNS', 5))
+    import_times = get_import_times(run(benchmark_env, args, importtime=True))
+
+    print("\n%s: %.1fms (%.1fms importing modules)\n  %-40s %10s %10s\n%s" % (
+        command, wall_time, sum(import_time[1] for import_time in import_times), 'module', 'self', 'cumulative',
+        format_import_times(import_times)
+    ))
+
+    baseline = read_baseline()
+    timings = baseline.setdefault(json.dumps(benchmark_env.sizes, sort_keys=True), {})
+
+    if os.environ.get('TAXI_BENCHMARK_UPDATE_BASELINE') or command not in timings:
+        timings[command] = round(wall_time, 1)
+        write_baseline(baseline)
+        pytest.skip("Recorded baseline for command `%s` with sizes %s" % (command, benchmark_env.sizes))
+
+    max_wall_time = timings[command] * get_setting('TOLERANCE', 1.5)
+
+    assert wall_time <= max_wall_time, (
+        "Startup time of `%s` regressed: %.1fms, baseline is %.1fms. Slowest imports:\n%s" % (
+            command, wall_time, timings[command], format_import_times(import_times)
+        )
+    )
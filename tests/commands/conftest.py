@@ -1,4 +1,3 @@
-import configparser
 import os
 
 import py
@@ -42,62 +41,28 @@ class TestBackendEntryPoint(object):
         return self.TestBackend
 
 
-class ConfigFile:
-    DEFAULT_CONFIG = {
-        'taxi': {
-            'editor': 'touch',
-            'date_format': '%d/%m/%Y',
-        },
-        'backends': {
-            'test': 'test:///',
-            'local': 'dummy:///',
-        },
-        'test_aliases': {
-            'alias_1': '123/456',
-            'post_push_fail': '123/457',
-            'fail': '123/458',
-        }
-    }
-
-    def __init__(self, path):
-        self.path = path
-        self.config = configparser.RawConfigParser()
-        self._sync = False
-
-        for section, params in self.DEFAULT_CONFIG.items():
-            for key, value in params.items():
-                self.set(section, key, value)
-
-        self.save()
-
-        self._sync = True
-
-    def set(self, section, attr, value):
-        if not self.config.has_section(section):
-            self.config.add_section(section)
-
-        self.config.set(section, attr, value)
-
-        if self._sync:
-            self.save()
-
-    def set_dict(self, options):
-        self.sync = False
-
-        for section, items in options.items():
-            for key, value in items.items():
-                self.set(section, key, value)
+class TestBatchBackendEntryPoint(object):
+    """
+    Dedicated backend for tests that pushes all its entries at once. Entries
+    with the alias `batch_fail` will fail when trying to push them.
+    """
+    class TestBatchBackend(BaseBackend):
+        def __init__(self, *args, **kwargs):
+            super(TestBatchBackendEntryPoint.TestBatchBackend, self).__init__(
+                *args, **kwargs
+            )
+            self.batches = []
 
-        self.sync = True
-        self.save()
+        def push_entries(self, entries):
+            self.batches.append(entries)
 
-    def clear_section(self, section):
-        self.config.remove_section(section)
-        self.config.add_section(section)
+            return [
+                PushEntryFailed("batch failure") if entry.alias == 'batch_fail' else 'batch #%d' % len(self.batches)
+                for date, entry in entries
+            ]
 
-    def save(self):
-        with open(self.path, 'w') as cf:
-            self.config.write(cf)
+    def load(self):
+        return self.TestBatchBackend
 
 
 class EntriesFileGenerator(py.path.local):
@@ -112,19 +77,6 @@ class EntriesFileGenerator(py.path.local):
         return self.tmpdir.join(expand_date(self.pattern, date))
 
 
-@pytest.fixture
-def config(tmpdir):
-    config_file = ConfigFile(str(tmpdir.join('config.ini')))
-    config_file.set('taxi', 'file', str(tmpdir.join('entries.tks')))
-
-    return config_file
-
-
-@pytest.fixture
-def data_dir(tmpdir):
-    return tmpdir.mkdir('data')
-
-
 @pytest.fixture
 def entries_file(tmpdir, config):
     new_entries_file = tmpdir.join('foo.tks')
@@ -159,5 +111,6 @@ def set_test_backends(monkeypatch):
         'taxi.backends': {
             'test': TestBackendEntryPoint(),
             'dummy': TestBackendEntryPoint(),
+            'batch': TestBatchBackendEntryPoint(),
         }
     })
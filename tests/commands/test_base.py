@@ -1,4 +1,16 @@
+import importlib
 import os
+import subprocess
+import sys
+
+import click
+import pytest
+
+from taxi.commands.base import BUILTIN_COMMANDS, cli as taxi_cli
+from taxi.plugins import plugins_registry
+from taxi.projects import ProjectsDb
+
+from . import conftest
 
 
 def test_run_without_config_file_creates_config_file(cli, config):
@@ -20,3 +32,91 @@ def test_wizard_constructs_correct_url_with_token(cli, config):
         config = f.read()
 
     assert 'dummy://token@timesheets.example.com' in config
+
+
+def test_aliases_are_only_loaded_when_needed(cli, entries_file, monkeypatch):
+    get_aliases_calls = []
+    get_aliases = ProjectsDb.get_aliases
+
+    def counting_get_aliases(projects_db):
+        get_aliases_calls.append(projects_db)
+        return get_aliases(projects_db)
+
+    monkeypatch.setattr(ProjectsDb, 'get_aliases', counting_get_aliases)
+    cli('current')
+
+    assert not get_aliases_calls
+
+    entries_file.write("20/01/2014\nalias_1 1 hello world\n")
+    stdout = cli('status')
+
+    assert len(get_aliases_calls) == 1
+    assert 'inexistent alias' not in stdout
+
+
+class CommandEntryPoint(object):
+    def __init__(self):
+        self.loaded = False
+
+    def load(self):
+        self.loaded = True
+
+        @taxi_cli.command(name='hello')
+        def hello():
+            click.echo("Hello world")
+
+
+@pytest.fixture
+def command_entry_point(monkeypatch):
+    command_entry_point = CommandEntryPoint()
+    monkeypatch.setattr(plugins_registry, '_loaded_commands', set())
+    monkeypatch.setattr(plugins_registry, '_entry_points', {
+        'taxi.backends': {
+            'test': conftest.TestBackendEntryPoint(),
+            'dummy': conftest.TestBackendEntryPoint(),
+        },
+        'taxi.commands': {
+            'hello': command_entry_point,
+        },
+    })
+
+    yield command_entry_point
+
+    taxi_cli.commands.pop('hello', None)
+
+
+def test_command_plugins_are_loaded_when_needed(cli, entries_file, command_entry_point):
+    cli('status')
+
+    assert not command_entry_point.loaded
+    assert cli('hello') == "Hello world\n"
+
+
+def test_builtin_commands_match_commands_definitions():
+    for name, lazy_command in BUILTIN_COMMANDS.items():
+        importlib.import_module(lazy_command.module)
+        command = taxi_cli.commands[name]
+
+        assert command.get_short_help_str(limit=200) == lazy_command.short_help
+        assert set(getattr(command, 'aliases', ())) == set(lazy_command.aliases)
+
+
+def test_builtin_commands_are_imported_when_needed():
+    modules = subprocess.check_output([sys.executable, '-c', (
+        "import sys, click\n"
+        "from taxi.commands.base import cli\n"
+        "cli.get_command(click.Context(cli), 'ci')\n"
+        "print(' '.join(sys.modules))"
+    )], universal_newlines=True).split()
+
+    assert 'taxi.commands.commit' in modules
+    assert 'taxi.commands.status' not in modules
+    assert 'taxi.commands.plugin' not in modules
+
+
+def test_help_lists_builtin_commands(cli):
+    stdout = cli('--help')
+
+    for name, lazy_command in BUILTIN_COMMANDS.items():
+        assert name in stdout
+        assert lazy_command.short_help in stdout
@@ -1,8 +1,12 @@
 import datetime
+import threading
 
+import pytest
 from freezegun import freeze_time
 
-from taxi.timesheet import EntriesCollection, TimesheetParser
+from taxi.backends import BaseBackend
+from taxi.commands.commit import push_entries_concurrently
+from taxi.timesheet import EntriesCollection, Entry, TimesheetParser
 
 from .assertions import line_in
 from .conftest import EntriesFileGenerator
@@ -273,3 +277,98 @@ fail  -1000 And a failing alias
     assert entries[0].pushed
     assert not entries[1].pushed
     assert entries[1].duration == (None, datetime.time(10))
+
+
+def test_concurrent_push_reports_entries_in_order(cli, config, entries_file):
+    config.set('taxi', 'push_workers', '4')
+    entries_file.write("""21/01/2014
+alias_1 1 entry 1
+fail 1 entry 2
+alias_1 1 entry 3
+post_push_fail 1 entry 4
+alias_1 1 entry 5
+""")
+    stdout = cli('commit', args=['--yes'])
+
+    positions = [stdout.index('entry %d' % i) for i in range(1, 6)]
+    assert positions == sorted(positions)
+    assert entries_file.readlines(cr=False) == [
+        '21/01/2014', '= alias_1 1 entry 1', 'fail 1 entry 2', '= alias_1 1 entry 3', 'post_push_fail 1 entry 4',
+        '= alias_1 1 entry 5', ''
+    ]
+
+
+def test_batch_backend_pushes_all_entries_at_once(cli, config, entries_file):
+    config.set('backends', 'batch', 'batch:///')
+    config.set('batch_aliases', 'batch_1', '1/2')
+    config.set('batch_aliases', 'batch_fail', '1/3')
+    entries_file.write("""21/01/2014
+batch_1 1 entry 1
+alias_1 1 entry 2
+batch_fail 1 entry 3
+
+22/01/2014
+batch_1 1 entry 4
+""")
+    stdout = cli('commit', args=['--yes'])
+
+    assert 'entry 1 (batch #1)' in stdout
+    assert 'entry 4 (batch #1)' in stdout
+    assert 'Failed, reason: batch failure' in stdout
+    assert entries_file.readlines(cr=False) == [
+        '21/01/2014', '= batch_1 1 entry 1', '= alias_1 1 entry 2', 'batch_fail 1 entry 3', '', '22/01/2014',
+        '= batch_1 1 entry 4', ''
+    ]
+
+
+def test_batch_backend_reports_entries_in_order(cli, config, entries_file):
+    config.set('taxi', 'push_workers', '4')
+    config.set('backends', 'batch', 'batch:///')
+    config.set('batch_aliases', 'batch_1', '1/2')
+    entries_file.write("""21/01/2014
+batch_1 1 entry 1
+alias_1 1 entry 2
+batch_1 1 entry 3
+""")
+    stdout = cli('commit', args=['--yes'])
+    positions = [stdout.index('entry %d' % i) for i in range(1, 4)]
+
+    assert positions == sorted(positions)
+    assert 'entry 3 (batch #1)' in stdout
+
+
+def test_interrupted_concurrent_push_waits_for_started_pushes():
+    second_push_started = threading.Event()
+    release_second_push = threading.Event()
+
+    class Backend(BaseBackend):
+        def push_entry(self, date, entry):
+            if entry.description == 'entry 1':
+                second_push_started.wait(5)
+            elif entry.description == 'entry 2':
+                second_push_started.set()
+                release_second_push.wait(5)
+
+            return entry.description
+
+    backend_a, backend_b = [Backend(None, None, None, None, None, {}, None) for i in range(2)]
+    entries = [Entry('alias_1', 1, 'entry %d' % i) for i in range(1, 4)]
+    date = datetime.date(2014, 1, 21)
+    pushed_entries = []
+
+    def pushed_entry(entry, backend, additional_info):
+        pushed_entries.append((entry.description, entry.push_error, additional_info))
+
+        if entry.description == 'entry 1':
+            # Let the second push finish a bit later to make sure the interruption is handled while it's running
+            threading.Timer(0.1, release_second_push.set).start()
+            raise KeyboardInterrupt()
+
+    # Entry 3 waits for entry 2 to be pushed since they use the same backend, which only has one worker
+    with pytest.raises(KeyboardInterrupt):
+        push_entries_concurrently(
+            [(date, entries[0], backend_a), (date, entries[1], backend_b), (date, entries[2], backend_b)],
+            1, pushed_entry
+        )
+
+    assert pushed_entries == [('entry 1', None, 'entry 1'), ('entry 2', None, 'entry 2')]
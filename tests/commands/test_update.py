@@ -1,4 +1,93 @@
+import json
+
+from taxi.projects import Activity, LocalProjectsDb, Project, ProjectsDb
+
+from . import conftest
+
+
 def test_update_doesnt_clean_local_aliases(cli, config):
     config.set('local_aliases', '_local1', '')
     stdout = cli('update')
     assert '_local1' not in stdout
+
+
+def test_update_keeps_projects_of_failing_backend(cli, config, data_dir, monkeypatch):
+    def get_projects(backend):
+        if backend.path == '/fail':
+            raise Exception("Connection refused")
+
+        project = Project('1', 'project from %s' % backend.path)
+        project.activities.append(Activity('2', 'activity'))
+
+        return [project]
+
+    monkeypatch.setattr(conftest.TestBackendEntryPoint.TestBackend, 'get_projects', get_projects)
+    config.set('backends', 'local', 'dummy:///local')
+    config.set('backends', 'other', 'dummy:///other')
+    cli('update')
+
+    config.set('backends', 'local', 'dummy:///fail')
+    config.set('backends', 'other', 'unknown:///other')
+    config.set('backends', 'test', 'test:///updated')
+    # Error messages are wrapped, so ignore line breaks
+    stdout = ' '.join(cli('update').split())
+    projects = ProjectsDb(str(data_dir)).get_projects()
+
+    assert "Could not fetch projects from backend `local`: Connection refused" in stdout
+    assert "Could not fetch projects from backend `other`: The requested backend `unknown`" in stdout
+    assert sorted((project.backend, project.name) for project in projects) == [
+        ('local', 'project from /local'), ('other', 'project from /other'), ('test', 'project from /updated')
+    ]
+
+
+def test_update_applies_projects_delta(cli, config, data_dir, monkeypatch):
+    sync_tokens = []
+
+    def get_projects_since(backend, sync_token):
+        sync_tokens.append(sync_token)
+
+        if sync_token is None:
+            return [Project('1', 'project 1'), Project('2', 'project 2'), Project('3', 'project 3')], [], 'token1'
+
+        project = Project('2', 'project 2 renamed')
+        project.activities.append(Activity('5', 'activity'))
+        project.aliases['my_alias'] = '5'
+
+        return [project, Project('4', 'project 4')], ['3'], 'token2'
+
+    def update(projects_db, projects, sync_tokens=None):
+        raise AssertionError("The projects database should only be rewritten on the first update")
+
+    monkeypatch.setattr(conftest.TestBackendEntryPoint.TestBackend, 'get_projects_since', get_projects_since)
+    config.clear_section('backends')
+    config.set('backends', 'test', 'test:///')
+    cli('update')
+    monkeypatch.setattr(ProjectsDb, 'update', update)
+    cli('update')
+    projects_db = ProjectsDb(str(data_dir))
+
+    assert sync_tokens == [None, 'token1']
+    assert sorted(project.name for project in projects_db.get_projects()) == [
+        'project 1', 'project 2 renamed', 'project 4'
+    ]
+    assert projects_db.get_sync_token('test') == 'token2'
+    assert projects_db.get_aliases()['my_alias'].mapping == ('2', '5')
+
+
+def test_update_replaces_outdated_projects_db(cli, data_dir, monkeypatch):
+    local_projects_db = LocalProjectsDb()
+    local_projects_db.VERSION = 1
+    data_dir.join(ProjectsDb.JSON_PROJECTS_FILE).write(json.dumps(local_projects_db.get_dump_object()))
+
+    def get_projects(backend):
+        project = Project('1', 'my project')
+        project.activities.append(Activity('2', 'my activity'))
+        project.aliases['my_alias'] = '2'
+
+        return [project]
+
+    monkeypatch.setattr(conftest.TestBackendEntryPoint.TestBackend, 'get_projects', get_projects)
+    stdout = cli('update')
+
+    assert "Projects database updated successfully." in stdout
+    assert ProjectsDb(str(data_dir)).get_aliases()['my_alias'].mapping == ('1', '2')
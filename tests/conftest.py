@@ -0,0 +1,74 @@
+import configparser
+
+import pytest
+
+
+class ConfigFile:
+    DEFAULT_CONFIG = {
+        'taxi': {
+            'editor': 'touch',
+            'date_format': '%d/%m/%Y',
+        },
+        'backends': {
+            'test': 'test:///',
+            'local': 'dummy:///',
+        },
+        'test_aliases': {
+            'alias_1': '123/456',
+            'post_push_fail': '123/457',
+            'fail': '123/458',
+        }
+    }
+
+    def __init__(self, path):
+        self.path = path
+        self.config = configparser.RawConfigParser()
+        self._sync = False
+
+        for section, params in self.DEFAULT_CONFIG.items():
+            for key, value in params.items():
+                self.set(section, key, value)
+
+        self.save()
+
+        self._sync = True
+
+    def set(self, section, attr, value):
+        if not self.config.has_section(section):
+            self.config.add_section(section)
+
+        self.config.set(section, attr, value)
+
+        if self._sync:
+            self.save()
+
+    def set_dict(self, options):
+        self.sync = False
+
+        for section, items in options.items():
+            for key, value in items.items():
+                self.set(section, key, value)
+
+        self.sync = True
+        self.save()
+
+    def clear_section(self, section):
+        self.config.remove_section(section)
+        self.config.add_section(section)
+
+    def save(self):
+        with open(self.path, 'w') as cf:
+            self.config.write(cf)
+
+
+@pytest.fixture
+def config(tmpdir):
+    config_file = ConfigFile(str(tmpdir.join('config.ini')))
+    config_file.set('taxi', 'file', str(tmpdir.join('entries.tks')))
+
+    return config_file
+
+
+@pytest.fixture
+def data_dir(tmpdir):
+    return tmpdir.mkdir('data')
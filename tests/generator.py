@@ -0,0 +1,293 @@
+"""
+Generate large timesheets, projects databases and aliases to test taxi with realistic amounts of data. The
+:class:`DataGenerator` class can be used from tests fixtures, and this module can also be run to generate a
+configuration file, timesheets and projects database in a directory::
+
+    python -m tests.generator --years=2 --entries-per-day=10 /tmp/taxi
+    taxi --config=/tmp/taxi/taxirc --taxi-dir=/tmp/taxi/data status
+"""
+import configparser
+import datetime
+import json
+import os
+import random
+
+import click
+
+from taxi.projects import Activity, LocalProjectsDb, Project, ProjectsDb
+from taxi.utils.file import expand_date
+
+WORDS = (
+    'accounting', 'api', 'backend', 'billing', 'cms', 'dashboard', 'design', 'documentation', 'frontend', 'hosting',
+    'infrastructure', 'intranet', 'maintenance', 'migration', 'mobile', 'newsletter', 'onboarding', 'platform',
+    'reporting', 'search', 'security', 'shop', 'support', 'website',
+)
+ACTIVITIES = (
+    'analysis', 'development', 'meeting', 'project management', 'review', 'testing', 'training', 'deployment',
+)
+
+
+class DataGenerator(object):
+    """
+    Generator of timesheets, projects and aliases. The same `seed` always generates the same data, up to the date
+    the timesheets history ends at (`until`, today by default).
+
+    Timesheets are generated for each working day of the last `years` years, with `entries_per_day` entries per day (at
+    most :attr:`MAX_ENTRIES_PER_DAY`, so that they all end before midnight). `durations` can be ``time`` (eg.
+    ``09:00-10:30``), ``decimal`` (eg. ``1.5``) or ``mixed``. `pushed_ratio` and `ignored_ratio` are the proportions of
+    entries that are flagged as pushed or ignored, and `comments_ratio` the proportion of entries that are followed by a
+    comment line. If `add_to_bottom` is set, dates are written in chronological order, otherwise the most recent date
+    comes first. If `in_progress` is set, the last entry of the `until` date doesn't have an end time (like an entry
+    created by ``taxi start``).
+
+    `nb_projects` projects are generated with `activities_per_project` activities each, and `nb_aliases` aliases are
+    mapped to activities of these projects.
+    """
+    BACKEND = 'test'
+    DURATIONS = ('time', 'decimal', 'mixed')
+    # Entries last at least 15 minutes and start at 08:00, so more entries than that wouldn't fit before midnight
+    MAX_ENTRIES_PER_DAY = 63
+
+    def __init__(self, pattern='%Y/%m.tks', date_format='%d/%m/%Y', years=1, entries_per_day=8, durations='time',
+                 pushed_ratio=0.0, ignored_ratio=0.0, comments_ratio=0.0, add_to_bottom=True, in_progress=False,
+                 nb_projects=1000, activities_per_project=5, nb_aliases=100, until=None, seed=0):
+        if durations not in self.DURATIONS:
+            raise ValueError("`durations` should be one of %s" % ', '.join(self.DURATIONS))
+
+        if entries_per_day > self.MAX_ENTRIES_PER_DAY:
+            raise ValueError("`entries_per_day` should be at most %d" % self.MAX_ENTRIES_PER_DAY)
+
+        self.pattern = pattern
+        self.date_format = date_format
+        self.years = years
+        self.entries_per_day = entries_per_day
+        self.durations = durations
+        self.pushed_ratio = pushed_ratio
+        self.ignored_ratio = ignored_ratio
+        self.comments_ratio = comments_ratio
+        self.add_to_bottom = add_to_bottom
+        self.in_progress = in_progress
+        self.nb_projects = nb_projects
+        self.activities_per_project = activities_per_project
+        self.nb_aliases = nb_aliases
+        self.until = until or datetime.date.today()
+        self.seed = seed
+
+    def get_projects(self):
+        """
+        Return the list of generated :class:`~taxi.projects.Project` objects. Projects define a shared alias for
+        their first activity.
+        """
+        rng = random.Random(self.seed)
+        projects = []
+
+        for project_id in range(1, self.nb_projects + 1):
+            project = Project(
+                str(project_id), '%s %s %d' % (rng.choice(WORDS), rng.choice(WORDS), project_id),
+                rng.choice([Project.STATUS_ACTIVE] * 8 + [Project.STATUS_FINISHED, Project.STATUS_NOT_STARTED])
+            )
+            project.backend = self.BACKEND
+
+            for activity_id in range(1, self.activities_per_project + 1):
+                project.activities.append(
+                    Activity(str(project_id * 100 + activity_id), ACTIVITIES[(activity_id - 1) % len(ACTIVITIES)])
+                )
+
+            if project.activities:
+                project.aliases['shared_%d' % project_id] = project.activities[0].id
+
+            projects.append(project)
+
+        return projects
+
+    def get_aliases(self):
+        """
+        Return a dict of the generated aliases, with aliases as keys and ``project_id/activity_id`` mappings as
+        values.
+        """
+        rng = random.Random(self.seed)
+        aliases = {}
+
+        for alias_id in range(1, self.nb_aliases + 1):
+            project_id = rng.randint(1, self.nb_projects)
+            activity_id = project_id * 100 + rng.randint(1, self.activities_per_project)
+            aliases['%s_%d' % (rng.choice(WORDS), alias_id)] = '%d/%d' % (project_id, activity_id)
+
+        return aliases
+
+    def get_config(self, timesheets_path):
+        """
+        Return the configuration sections matching the generated data, as a dict of dicts. `timesheets_path` is the
+        directory the timesheets are written to.
+        """
+        return {
+            'taxi': {
+                'file': os.path.join(timesheets_path, self.pattern),
+                'date_format': self.date_format,
+                'nb_previous_files': str(max(len(self.get_dates_by_file()) - 1, 1)),
+                'auto_add': 'bottom' if self.add_to_bottom else 'top',
+            },
+            'backends': {
+                self.BACKEND: '%s:///' % self.BACKEND,
+            },
+            '%s_aliases' % self.BACKEND: self.get_aliases(),
+        }
+
+    def get_dates(self):
+        """
+        Return the list of working days the timesheets are generated for, in chronological order. If there's an entry
+        in progress, the last date is always `until`, even if it's not a working day.
+        """
+        date = self.until - datetime.timedelta(days=round(self.years * 365))
+        dates = []
+
+        while date <= self.until:
+            if date.weekday() < 5 or (self.in_progress and date == self.until):
+                dates.append(date)
+
+            date += datetime.timedelta(days=1)
+
+        return dates
+
+    def get_dates_by_file(self):
+        """
+        Return a dict with the timesheet files paths (relative to the timesheets directory) as keys and the list of
+        the dates they contain as values.
+        """
+        dates_by_file = {}
+
+        for date in self.get_dates():
+            dates_by_file.setdefault(expand_date(self.pattern, date), []).append(date)
+
+        return dates_by_file
+
+    def get_timesheets(self):
+        """
+        Return a dict with the timesheet files paths (relative to the timesheets directory) as keys and their
+        contents as values.
+        """
+        rng = random.Random(self.seed)
+        aliases = sorted(self.get_aliases())
+        last_date = self.get_dates()[-1]
+        timesheets = {}
+
+        for path, dates in self.get_dates_by_file().items():
+            blocks = [self.get_date_lines(rng, date, aliases, date == last_date) for date in dates]
+
+            if not self.add_to_bottom:
+                blocks.reverse()
+
+            timesheets[path] = '\n\n'.join('\n'.join(lines) for lines in blocks) + '\n'
+
+        return timesheets
+
+    def get_date_lines(self, rng, date, aliases, is_last_date):
+        """
+        Return the lines of the timesheet block of the given `date`.
+        """
+        lines = [date.strftime(self.date_format)]
+        start_time = 8 * 60
+        # Keep all the entries of the day between 08:00 and midnight
+        max_quarters = max(1, 64 // max(self.entries_per_day, 1))
+
+        for position in range(self.entries_per_day):
+            duration = rng.randint(1, max_quarters) * 15
+            end_time = start_time + duration
+            is_last_entry = is_last_date and position == self.entries_per_day - 1
+            use_decimal = self.durations == 'decimal' or (self.durations == 'mixed' and rng.random() < 0.5)
+
+            if is_last_entry and self.in_progress:
+                duration_text = '%02d:%02d-?' % divmod(start_time, 60)
+            elif use_decimal:
+                duration_text = '%g' % (duration / 60)
+            else:
+                duration_text = '%02d:%02d-%02d:%02d' % (divmod(start_time, 60) + divmod(end_time, 60))
+
+            flag_random = rng.random()
+            if is_last_entry:
+                flag = ''
+            elif flag_random < self.pushed_ratio:
+                flag = '= '
+            elif flag_random < self.pushed_ratio + self.ignored_ratio:
+                flag = '? '
+            else:
+                flag = ''
+
+            lines.append('%s%s %s %s' % (flag, rng.choice(aliases), duration_text, rng.choice(ACTIVITIES).capitalize()))
+
+            if rng.random() < self.comments_ratio:
+                lines.append('# %s' % rng.choice(WORDS))
+
+            start_time = end_time
+
+        return lines
+
+    def write_projects_db(self, data_dir, json_format=False):
+        """
+        Write the generated projects to the projects database in `data_dir`. If `json_format` is set, write them to a
+        ``projects.json`` file (the format used by previous versions of taxi, imported on first use) instead.
+        """
+        os.makedirs(data_dir, exist_ok=True)
+
+        if json_format:
+            with open(os.path.join(data_dir, ProjectsDb.JSON_PROJECTS_FILE), 'w') as projects_file:
+                json.dump(LocalProjectsDb(self.get_projects()).get_dump_object(), projects_file)
+        else:
+            ProjectsDb(data_dir).update(self.get_projects())
+
+    def write_timesheets(self, timesheets_path):
+        """
+        Write the generated timesheets to the `timesheets_path` directory.
+        """
+        for path, contents in self.get_timesheets().items():
+            full_path = os.path.join(timesheets_path, path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+            with open(full_path, 'w') as timesheet_file:
+                timesheet_file.write(contents)
+
+
+@click.command()
+@click.argument('output_dir', type=click.Path(file_okay=False))
+@click.option('--pattern', default='%Y/%m.tks', show_default=True, help="Timesheet files pattern.")
+@click.option('--date-format', default='%d/%m/%Y', show_default=True)
+@click.option('--years', default=1.0, show_default=True, help="Years of history.")
+@click.option('--entries-per-day', type=click.IntRange(max=DataGenerator.MAX_ENTRIES_PER_DAY), default=8,
+              show_default=True)
+@click.option('--durations', type=click.Choice(DataGenerator.DURATIONS), default='time', show_default=True)
+@click.option('--pushed-ratio', default=0.0, show_default=True, help="Proportion of pushed entries.")
+@click.option('--ignored-ratio', default=0.0, show_default=True, help="Proportion of ignored entries.")
+@click.option('--comments-ratio', default=0.0, show_default=True, help="Proportion of entries followed by a comment.")
+@click.option('--order', type=click.Choice(['bottom', 'top']), default='bottom', show_default=True,
+              help="Add dates to the bottom or to the top of the timesheets.")
+@click.option('--in-progress', is_flag=True, help="Leave the last entry in progress.")
+@click.option('--projects', 'nb_projects', default=1000, show_default=True)
+@click.option('--activities-per-project', default=5, show_default=True)
+@click.option('--aliases', 'nb_aliases', default=100, show_default=True)
+@click.option('--json', 'json_format', is_flag=True, help="Write the projects to a legacy projects.json file.")
+@click.option('--seed', default=0, show_default=True)
+def main(output_dir, order, json_format, **kwargs):
+    """
+    Generate a configuration file (taxirc), timesheets (in the timesheets directory) and a projects database (in the
+    data directory) in OUTPUT_DIR.
+    """
+    generator = DataGenerator(add_to_bottom=order == 'bottom', **kwargs)
+    output_dir = os.path.abspath(output_dir)
+    config_path = os.path.join(output_dir, 'taxirc')
+    data_dir = os.path.join(output_dir, 'data')
+
+    generator.write_timesheets(os.path.join(output_dir, 'timesheets'))
+    generator.write_projects_db(data_dir, json_format=json_format)
+
+    config = configparser.RawConfigParser()
+    config.read_dict(generator.get_config(os.path.join(output_dir, 'timesheets')))
+    with open(config_path, 'w') as config_file:
+        config.write(config_file)
+
+    click.echo("Generated data in %s, run taxi with `taxi --config=%s --taxi-dir=%s`" % (
+        output_dir, config_path, data_dir
+    ))
+
+
+if __name__ == '__main__':
+    main()
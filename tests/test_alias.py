@@ -1,3 +1,5 @@
+import pytest
+
 from taxi.aliases import AliasesDatabase, Mapping
 
 
@@ -140,3 +142,80 @@ def test_filter_from_alias():
         'foo': Mapping(mapping=(1, 2), backend='test'),
         'foobar': Mapping(mapping=(1, 3), backend='test'),
     }
+
+
+def test_alias_loader_is_called_on_first_access():
+    calls = []
+
+    def loader():
+        calls.append(True)
+        return {'foo': Mapping(mapping=(1, 2), backend='test')}
+
+    db = AliasesDatabase()
+    db.set_loader(loader)
+
+    assert not calls
+    assert 'foo' in db
+    assert 'bar' not in db
+    assert len(calls) == 1
+
+
+def test_failed_alias_loader_is_called_again():
+    calls = []
+
+    def loader():
+        calls.append(True)
+        raise ValueError("outdated")
+
+    db = AliasesDatabase()
+    db.set_loader(loader)
+
+    for i in range(2):
+        with pytest.raises(ValueError):
+            'foo' in db
+
+    assert len(calls) == 2
+
+
+def test_get_close_matches():
+    db = AliasesDatabase({
+        'pingpong': Mapping(mapping=(1, 2), backend='test'),
+        'meeting': Mapping(mapping=(1, 3), backend='test'),
+        'support_internal': Mapping(mapping=(1, 4), backend='test'),
+    })
+
+    assert db.get_close_matches('pinpong')[0] == 'pingpong'
+    assert db.get_close_matches('zzz') == []
+
+    db['meetings'] = Mapping(mapping=(1, 5), backend='test')
+
+    assert db.get_close_matches('meetin')[:2] == ['meeting', 'meetings']
+
+
+def test_get_close_matches_without_common_ngrams():
+    db = AliasesDatabase({
+        'ba': Mapping(mapping=(1, 2), backend='test'),
+    })
+
+    assert db.get_close_matches('ab') == ['ba']
+
+
+def test_filter_from_mapping_after_changes():
+    db = AliasesDatabase({
+        'foo': Mapping(mapping=(1, 2), backend='test'),
+        'bar': Mapping(mapping=(1, 3), backend='test'),
+    })
+    assert list(db.filter_from_mapping((1, None))) == ['foo', 'bar']
+
+    db['foo'] = Mapping(mapping=(2, 2), backend='test')
+    db.update({'baz': Mapping(mapping=(1, 3), backend='other')})
+
+    assert list(db.filter_from_mapping((1, None))) == ['bar', 'baz']
+    assert list(db.filter_from_mapping((1, 3), backend='other')) == ['baz']
+    assert list(db.filter_from_mapping(None, backend='test')) == ['bar', 'foo']
+    assert db.get_mapping_aliases(Mapping(mapping=(2, 2), backend='test')) == ['foo']
+    assert db.get_mapping_aliases(Mapping(mapping=(1, 2), backend='test')) == []
+
+    db.reset()
+
+    assert db.filter_from_mapping((1, None)) == {}
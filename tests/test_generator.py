@@ -0,0 +1,90 @@
+import datetime
+
+import pytest
+from click.testing import CliRunner
+
+from taxi.projects import ProjectsDb
+from taxi.timesheet import TimesheetCollection, TimesheetParser
+
+from .generator import DataGenerator, main
+
+
+def load_timesheets(generator, tmpdir):
+    generator.write_timesheets(str(tmpdir))
+    config = generator.get_config(str(tmpdir))['taxi']
+    parser = TimesheetParser(date_format=config['date_format'], add_date_to_bottom=generator.add_to_bottom)
+
+    return TimesheetCollection.load(config['file'], int(config['nb_previous_files']), parser)
+
+
+def test_timesheets_contain_all_dates_and_entries(tmpdir):
+    generator = DataGenerator(years=0.25, entries_per_day=6, durations='mixed', comments_ratio=0.5)
+    entries = load_timesheets(generator, tmpdir).entries
+
+    assert sorted(entries) == generator.get_dates()
+    assert all(len(date_entries) == 6 for date_entries in entries.values())
+    durations_types = {type(entry.duration) for date_entries in entries.values() for entry in date_entries}
+    assert durations_types == {tuple, float}
+
+
+def test_timesheets_use_configured_order_and_flags(tmpdir):
+    generator = DataGenerator(years=0.1, pushed_ratio=0.5, ignored_ratio=0.2, add_to_bottom=False, in_progress=True)
+    today = datetime.date.today()
+    timesheets = load_timesheets(generator, tmpdir)
+    entries = [entry for date_entries in timesheets.entries.values() for entry in date_entries]
+    lines = timesheets.latest().entries.to_lines()
+
+    assert lines[0] == today.strftime('%d/%m/%Y')
+    assert timesheets.latest().entries[today][-1].in_progress
+    assert any(entry.pushed for entry in entries)
+    assert any(entry.ignored for entry in entries)
+
+
+def test_timesheets_with_max_entries_per_day_can_be_parsed(tmpdir):
+    generator = DataGenerator(years=0.02, entries_per_day=DataGenerator.MAX_ENTRIES_PER_DAY, in_progress=True)
+    entries = load_timesheets(generator, tmpdir).entries
+
+    assert all(len(date_entries) == DataGenerator.MAX_ENTRIES_PER_DAY for date_entries in entries.values())
+
+
+def test_too_many_entries_per_day_are_rejected():
+    with pytest.raises(ValueError):
+        DataGenerator(entries_per_day=DataGenerator.MAX_ENTRIES_PER_DAY + 1)
+
+
+def test_same_seed_generates_same_data():
+    until = datetime.date(2024, 3, 15)
+
+    generators = [DataGenerator(years=0.1, until=until) for i in range(2)]
+
+    assert generators[0].get_timesheets() == generators[1].get_timesheets()
+    assert DataGenerator(until=until).get_aliases() != DataGenerator(until=until, seed=1).get_aliases()
+
+
+def test_aliases_map_to_generated_projects(tmpdir):
+    generator = DataGenerator(nb_projects=20, nb_aliases=50)
+    generator.write_projects_db(str(tmpdir))
+    projects_db = ProjectsDb(str(tmpdir))
+
+    assert len(projects_db.get_projects()) == 20
+    assert len(projects_db.get_aliases()) == 20
+
+    for mapping in generator.get_aliases().values():
+        project_id, activity_id = mapping.split('/')
+        assert projects_db.get(project_id).get_activity(activity_id) is not None
+
+
+def test_projects_can_be_written_to_json_db(tmpdir):
+    DataGenerator(nb_projects=20).write_projects_db(str(tmpdir), json_format=True)
+
+    assert tmpdir.join(ProjectsDb.JSON_PROJECTS_FILE).check()
+    assert len(ProjectsDb(str(tmpdir)).get_projects()) == 20
+
+
+def test_command_generates_config_timesheets_and_projects(tmpdir):
+    result = CliRunner().invoke(main, [str(tmpdir), '--years=0.1', '--projects=10', '--aliases=5'])
+
+    assert result.exit_code == 0
+    assert tmpdir.join('taxirc').check()
+    assert tmpdir.join('data', ProjectsDb.PROJECTS_FILE).check()
+    assert tmpdir.join('timesheets').listdir()
@@ -1,7 +1,11 @@
+import concurrent.futures
+import datetime
+import json
 import pickle
 import pytest
 
 from taxi import projects
+from taxi.aliases import Mapping
 
 
 def test_legacy_projects_db(tmpdir):
@@ -20,12 +24,158 @@ def test_legacy_projects_db(tmpdir):
 
 def test_outdated_projects_db(tmpdir):
     # Simulate a projects db version change
-    projects.LocalProjectsDb.VERSION = 1
+    version = projects.ProjectsDb.SCHEMA_VERSION
+    projects.ProjectsDb.SCHEMA_VERSION = version - 1
     try:
         p = projects.ProjectsDb(tmpdir.strpath)
         p.update([])
     finally:
-        projects.LocalProjectsDb.VERSION = 2
+        projects.ProjectsDb.SCHEMA_VERSION = version
 
     with pytest.raises(projects.OutdatedProjectsDbException):
         p.get_projects()
+
+
+def test_legacy_json_projects_db(tmpdir):
+    projects_db_file = tmpdir.join(projects.ProjectsDb.JSON_PROJECTS_FILE)
+    local_projects_db = projects.LocalProjectsDb()
+    local_projects_db.VERSION = 1
+
+    with projects_db_file.open(mode='w') as f:
+        json.dump(local_projects_db.get_dump_object(), f)
+
+    p = projects.ProjectsDb(tmpdir.strpath)
+    with pytest.raises(projects.OutdatedProjectsDbException):
+        p.get_projects()
+
+
+def test_json_projects_db_is_migrated(tmpdir):
+    project = projects.Project('42', 'my project', projects.Project.STATUS_ACTIVE)
+    project.backend = 'test'
+    project.activities.append(projects.Activity('1', 'my activity'))
+    project.aliases['my_alias'] = '1'
+    local_projects_db = projects.LocalProjectsDb([project], {'test': 'token'})
+    local_projects_db.VERSION = projects.ProjectsDb.JSON_VERSION
+
+    with tmpdir.join(projects.ProjectsDb.JSON_PROJECTS_FILE).open(mode='w') as f:
+        json.dump(local_projects_db.get_dump_object(), f)
+
+    p = projects.ProjectsDb(tmpdir.strpath)
+
+    assert [project.name for project in p.get_projects()] == ['my project']
+    assert p.get('42', 'test').get_activity('1').name == 'my activity'
+    assert p.get_aliases()['my_alias'].mapping == ('42', '1')
+    assert p.get_sync_token('test') == 'token'
+    assert tmpdir.join(projects.ProjectsDb.PROJECTS_FILE).check()
+
+
+def test_lookups(tmpdir):
+    projects_list = []
+    for project_id, name, backend in [('1', 'Été project', 'foo'), ('2', 'Other project', 'foo'),
+                                      ('1', 'Été project', 'bar')]:
+        project = projects.Project(project_id, name, projects.Project.STATUS_ACTIVE)
+        project.backend = backend
+        project.aliases['alias_%s_%s' % (backend, project_id)] = '3'
+        projects_list.append(project)
+
+    p = projects.ProjectsDb(tmpdir.strpath)
+    p.update(projects_list)
+
+    assert p.get('1').backend == 'foo'
+    assert p.get('1', 'bar').backend == 'bar'
+    assert p.get('1', 'baz') is None
+    assert p.get('1') is p.get('1', 'foo')
+    assert [(project.id, project.backend) for project in p.search(['été'])] == [('1', 'foo'), ('1', 'bar')]
+    assert [project.id for project in p.search(['project', '2'])] == ['2']
+    assert [project.id for project in p.search(['été', '2'])] == []
+    assert [project.id for project in p.search(['project'], backend='bar')] == ['1']
+    assert p.get_alias('alias_bar_1') == Mapping(mapping=('1', '3'), backend='bar')
+    assert p.get_alias('alias_baz_1') is None
+
+
+def test_mapping_summary(tmpdir):
+    project = projects.Project('1', 'my project', projects.Project.STATUS_ACTIVE)
+    project.backend = 'foo'
+    project.end_date = datetime.date(2000, 1, 1)
+    project.activities.append(projects.Activity('2', 'my activity', False))
+    other_project = projects.Project('1', 'other project', projects.Project.STATUS_ACTIVE)
+    other_project.backend = 'bar'
+    other_project.activities.append(projects.Activity('3', 'other activity'))
+
+    p = projects.ProjectsDb(tmpdir.strpath)
+    p.update([project, other_project])
+
+    summary_project, summary_activity = p.get_mapping_summary(Mapping(mapping=('1', '2'), backend='foo'))
+    assert (summary_project.name, summary_project.end_date, summary_project.is_active()) == (
+        'my project', datetime.date(2000, 1, 1), False
+    )
+    assert (summary_activity.name, summary_activity.is_active()) == ('my activity', False)
+    assert p.get_mapping_summary(Mapping(mapping=('1', '3'), backend=None))[1] is None
+    assert p.get_mapping_summary(Mapping(mapping=('1', '3'), backend='bar'))[1].name == 'other activity'
+    assert p.get_mapping_summary(Mapping(mapping=('1', None), backend='bar'))[0].name == 'other project'
+    assert p.get_mapping_summary(Mapping(mapping=('4', '2'), backend='foo')) == (None, None)
+
+
+def test_search_results_are_ranked(tmpdir):
+    projects_list = []
+    for project_id, name in [('1', 'Website redesign'), ('2', 'Intranet'), ('3', 'Intranet maintenance'),
+                             ('4', 'Support intranet'), ('5', 'Support'), ('6', 'Company-intranet'),
+                             ('7', 'Support (intranet)')]:
+        project = projects.Project(project_id, name, projects.Project.STATUS_ACTIVE)
+        project.backend = 'test'
+        projects_list.append(project)
+
+    p = projects.ProjectsDb(tmpdir.strpath)
+    p.update(projects_list)
+
+    assert [project.id for project in p.search(['intranet'])] == ['2', '3', '4', '6', '7']
+    assert [project.id for project in p.search(['support', 'intra'])] == ['4', '7']
+    assert [project.id for project in p.search(['intranet', '3'])] == ['3']
+    assert [project.id for project in p.search(['tra'])] == ['2', '3', '4', '6', '7']
+    assert [project.id for project in p.search(['es'])] == ['1']
+
+
+def test_projects_db_can_be_used_from_other_threads(tmpdir):
+    project = projects.Project('1', 'my project', projects.Project.STATUS_ACTIVE)
+    project.backend = 'test'
+
+    p = projects.ProjectsDb(tmpdir.strpath)
+    p.update([project])
+    assert p.get('1').name == 'my project'
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        get_future = executor.submit(p.get, '1')
+        search_future = executor.submit(p.search, ['project'])
+
+        assert get_future.result() is p.get('1')
+        assert [project.id for project in search_future.result()] == ['1']
+
+
+def test_apply_deltas(tmpdir):
+    projects_list = []
+    for project_id, name, backend in [('1', 'Website', 'foo'), ('2', 'Intranet', 'foo'), ('1', 'Support', 'bar'),
+                                      ('1', 'Old project', 'removed')]:
+        project = projects.Project(project_id, name, projects.Project.STATUS_ACTIVE)
+        project.backend = backend
+        project.activities.append(projects.Activity('3', 'activity'))
+        project.aliases['alias_%s_%s' % (backend, project_id)] = '3'
+        projects_list.append(project)
+
+    p = projects.ProjectsDb(tmpdir.strpath)
+    p.update(projects_list, {'foo': 'token1', 'removed': 'token'})
+
+    renamed_project = projects.Project('2', 'Extranet', projects.Project.STATUS_ACTIVE)
+    renamed_project.backend = 'foo'
+    renamed_project.aliases['renamed_alias'] = '4'
+    renamed_project.activities.append(projects.Activity('4', 'new activity'))
+    p.apply_deltas({'foo': ([renamed_project], ['1'])}, {'foo': 'token2'}, ['foo', 'bar'])
+
+    assert [(project.backend, project.id, project.name) for project in p.get_projects()] == [
+        ('bar', '1', 'Support'), ('foo', '2', 'Extranet')
+    ]
+    assert p.search(['intranet']) == []
+    assert [project.id for project in p.search(['extra'])] == ['2']
+    assert sorted(p.get_aliases()) == ['alias_bar_1', 'renamed_alias']
+    assert p.get_mapping_summary(Mapping(mapping=('2', '3'), backend='foo'))[1] is None
+    assert p.get_mapping_summary(Mapping(mapping=('2', '4'), backend='foo'))[1].name == 'new activity'
+    assert (p.get_sync_token('foo'), p.get_sync_token('removed')) == ('token2', None)
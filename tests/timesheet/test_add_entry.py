@@ -74,3 +74,38 @@ foo 09:00-10:00 baz"""
         self.assertEqual(t.entries.to_lines(), [
             '10.10.2012', '', 'bar 2 baz'
         ])
+
+    def test_add_entry_after_last_entry_of_date(self):
+        contents = """10.10.2012
+foo 09:00-10:00 baz
+# comment
+
+11.10.2012
+foo 1 baz
+
+10.10.2012
+foo 2 baz"""
+        t = create_timesheet(contents)
+        t.entries[datetime.date(2012, 10, 10)].append(Entry('bar', 2, 'baz'))
+        t.entries[datetime.date(2012, 10, 11)].append(Entry('bar', 3, 'baz'))
+        t.entries[datetime.date(2012, 10, 10)].append(Entry('bar', 4, 'baz'))
+
+        self.assertEqual(t.entries.to_lines(), [
+            '10.10.2012', 'foo 09:00-10:00 baz', 'bar 2 baz', 'bar 4 baz', '# comment', '', '11.10.2012',
+            'foo 1 baz', 'bar 3 baz', '', '10.10.2012', 'foo 2 baz'
+        ])
+
+    def test_add_entry_after_deleting_last_entry_of_date(self):
+        contents = """10.10.2012
+foo 1 baz
+foo 2 baz
+
+11.10.2012
+foo 3 baz"""
+        t = create_timesheet(contents)
+        del t.entries[datetime.date(2012, 10, 10)][1]
+        t.entries[datetime.date(2012, 10, 10)].append(Entry('bar', 4, 'baz'))
+
+        self.assertEqual(t.entries.to_lines(), [
+            '10.10.2012', 'foo 1 baz', 'bar 4 baz', '', '11.10.2012', 'foo 3 baz'
+        ])
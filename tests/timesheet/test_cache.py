@@ -0,0 +1,103 @@
+import datetime
+import os
+
+import pytest
+
+from taxi.timesheet import Entry, Timesheet, TimesheetParser, TimesheetsCache
+
+
+class CountingParser(TimesheetParser):
+    def __init__(self, *args, **kwargs):
+        super(CountingParser, self).__init__(*args, **kwargs)
+        self.nb_parsed_files = 0
+
+    def iter_parse(self, fileobj):
+        self.nb_parsed_files += 1
+        return super(CountingParser, self).iter_parse(fileobj)
+
+
+@pytest.fixture
+def timesheet_file(tmpdir):
+    timesheet_file = tmpdir.join('timesheet.tks')
+    timesheet_file.write("10.10.2012\nfoo 09:00-10:00 baz\nbar -11:00 qux\n")
+
+    return timesheet_file
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return TimesheetsCache(str(tmpdir.join('cache')))
+
+
+def test_unchanged_timesheet_is_not_parsed_again(timesheet_file, cache):
+    parser = CountingParser()
+    Timesheet.load(str(timesheet_file), parser=parser, cache=cache)
+    timesheet = Timesheet.load(str(timesheet_file), parser=parser, cache=cache)
+
+    assert parser.nb_parsed_files == 1
+    assert str(timesheet) == "10.10.2012\nfoo 09:00-10:00 baz\nbar -11:00 qux"
+    assert timesheet.entries[datetime.date(2012, 10, 10)][1].hours == 1
+
+
+def test_changed_timesheet_is_parsed_again(timesheet_file, cache):
+    parser = CountingParser()
+    Timesheet.load(str(timesheet_file), parser=parser, cache=cache)
+    timesheet_file.write("10.10.2012\nfoo 09:00-10:00 baz\nbar 1 qux\n")
+    timesheet = Timesheet.load(str(timesheet_file), parser=parser, cache=cache)
+
+    assert parser.nb_parsed_files == 2
+    assert timesheet.entries[datetime.date(2012, 10, 10)][1].alias == 'bar'
+
+
+def test_timesheet_is_parsed_again_when_flags_change(timesheet_file, cache):
+    Timesheet.load(str(timesheet_file), parser=CountingParser(), cache=cache)
+    parser = CountingParser(flags_repr={Entry.FLAG_IGNORED: '!', Entry.FLAG_PUSHED: '*'})
+    Timesheet.load(str(timesheet_file), parser=parser, cache=cache)
+
+    assert parser.nb_parsed_files == 1
+
+
+def test_corrupt_cache_file_is_ignored(timesheet_file, cache):
+    Timesheet.load(str(timesheet_file), parser=CountingParser(), cache=cache)
+
+    with open(cache.get_cache_file_path(str(timesheet_file)), 'wb') as cache_file:
+        cache_file.write(b'foobar')
+
+    parser = CountingParser()
+    timesheet = Timesheet.load(str(timesheet_file), parser=parser, cache=cache)
+
+    assert parser.nb_parsed_files == 1
+    assert len(timesheet.entries[datetime.date(2012, 10, 10)]) == 2
+
+
+def test_truncated_cache_file_is_ignored(timesheet_file, cache):
+    Timesheet.load(str(timesheet_file), parser=CountingParser(), cache=cache)
+    cache_file_path = cache.get_cache_file_path(str(timesheet_file))
+
+    with open(cache_file_path, 'rb') as cache_file:
+        contents = cache_file.read()
+
+    # Depending on where the file is truncated, unpickling it raises different exceptions
+    for length in (2, len(contents) // 2):
+        with open(cache_file_path, 'wb') as cache_file:
+            cache_file.write(contents[:length])
+
+        parser = CountingParser()
+        timesheet = Timesheet.load(str(timesheet_file), parser=parser, cache=cache)
+
+        assert parser.nb_parsed_files == 1
+        assert len(timesheet.entries[datetime.date(2012, 10, 10)]) == 2
+
+
+def test_cache_of_changed_timesheet_replaces_previous_cache(timesheet_file, cache):
+    Timesheet.load(str(timesheet_file), parser=CountingParser(), cache=cache)
+    timesheet_file.write("10.10.2012\nfoo 09:00-10:00 baz\n")
+    Timesheet.load(str(timesheet_file), parser=CountingParser(), cache=cache)
+
+    assert os.listdir(cache.path) == [os.path.basename(cache.get_cache_file_path(str(timesheet_file)))]
+
+
+def test_missing_timesheet_is_not_cached(tmpdir, cache):
+    Timesheet.load(str(tmpdir.join('missing.tks')), cache=cache)
+
+    assert not os.path.exists(cache.path)
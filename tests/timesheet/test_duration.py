@@ -1,5 +1,7 @@
 import datetime
 
+from taxi.timesheet import Entry
+
 from . import create_timesheet
 
 
@@ -20,3 +22,36 @@ foo     -1300 bar"""
 
     t = create_timesheet(contents)
     assert list(t.entries.values())[0][2].duration == (None, datetime.time(13, 0))
+
+
+def test_hours_are_updated_when_duration_changes():
+    t = create_timesheet("10.10.2012\nfoo 0900-1000 baz")
+    entry = t.entries[datetime.date(2012, 10, 10)][0]
+    assert entry.hours == 1
+
+    entry.duration = (datetime.time(9), datetime.time(11, 30))
+    assert entry.hours == 2.5
+
+
+def test_hours_are_updated_when_previous_entry_end_time_changes():
+    t = create_timesheet("10.10.2012\nfoo 0900-1000 baz\nbar -1100 bar")
+    previous_entry, entry = t.entries[datetime.date(2012, 10, 10)]
+    assert entry.hours == 1
+
+    previous_entry.duration = (datetime.time(9), datetime.time(10, 30))
+    assert entry.hours == 0.5
+
+
+def test_hours_of_entry_ending_after_midnight():
+    entry = Entry('foo', (datetime.time(23), datetime.time(1)), 'baz')
+
+    assert entry.hours == 2
+
+
+def test_hash_is_updated_when_flags_change():
+    t = create_timesheet("10.10.2012\nfoo 0900-1000 baz")
+    entry = t.entries[datetime.date(2012, 10, 10)][0]
+    entry_hash = entry.hash
+
+    entry.pushed = True
+    assert entry.hash != entry_hash
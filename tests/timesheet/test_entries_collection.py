@@ -1,5 +1,7 @@
 import datetime
 
+import pytest
+
 from taxi.timesheet import EntriesCollection, Entry, TimesheetParser
 
 
@@ -103,6 +105,30 @@ _internal 0800-0900 Fix printer""")
     assert entries_collection.parser.to_text(entries_collection.lines[0]) == "21.01.2014"
 
 
+def test_remove_entries_slice_removes_lines():
+    entries_collection = EntriesCollection(TimesheetParser(), """20.01.2014
+_internal 0800-0900 Fix coffee machine
+taxi 2 Work a bit
+taxi 1 Work a bit more""")
+
+    del entries_collection[datetime.date(2014, 1, 20)][:2]
+
+    assert entries_collection.to_lines() == ["20.01.2014", "taxi 1 Work a bit more"]
+
+
+def test_remove_entries_slice_removes_date():
+    entries_collection = EntriesCollection(TimesheetParser(), """20.01.2014
+_internal 0800-0900 Fix coffee machine
+taxi 2 Work a bit
+
+21.01.2014
+_internal 0800-0900 Fix printer""")
+
+    del entries_collection[datetime.date(2014, 1, 20)][:]
+
+    assert entries_collection.to_lines() == ["21.01.2014", "_internal 0800-0900 Fix printer"]
+
+
 def test_insert_to_bottom():
     parser = TimesheetParser(add_date_to_bottom=True)
     entries_collection = EntriesCollection(parser, """20.01.2014
@@ -129,3 +155,35 @@ _internal 0800-0900 Fix coffee machine""")
     assert entries_collection.parser.to_text(entries_collection.lines[0]) == "21.01.2014"
     assert entries_collection.parser.to_text(entries_collection.lines[1]) == ""
     assert entries_collection.lines[2] == entry_line
+
+
+def test_entry_records_changed_attributes():
+    entry = Entry('taxi', 4, 'Work a bit', flags={Entry.FLAG_PUSHED})
+    assert not entry._changed_attrs
+
+    entry.description = 'Work a lot'
+    entry.ignored = True
+
+    assert entry._changed_attrs == {'description', 'flags'}
+    assert entry.flags == {Entry.FLAG_IGNORED, Entry.FLAG_PUSHED}
+
+
+def test_entry_flags_cant_be_changed_through_flags_copy():
+    entry = Entry('taxi', 4, 'Work a bit')
+    entry.flags.add(Entry.FLAG_PUSHED)
+
+    assert not entry.pushed
+    assert not entry._changed_attrs
+
+
+def test_removing_unset_flag_raises_key_error():
+    entry = Entry('taxi', 4, 'Work a bit')
+
+    with pytest.raises(KeyError):
+        entry.remove_flag(Entry.FLAG_PUSHED)
+
+
+def test_unsupported_flag_is_not_set():
+    entry = Entry('taxi', 4, 'Work a bit', flags={Entry.FLAG_PUSHED})
+
+    assert not entry.has_flag('foo')
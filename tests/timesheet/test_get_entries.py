@@ -1,4 +1,6 @@
-from taxi.timesheet import EntriesCollection, Timesheet
+import datetime
+
+from taxi.timesheet import EntriesCollection, Entry, Timesheet
 from taxi.timesheet.parser import TimesheetParser
 from . import create_timesheet
 
@@ -37,3 +39,66 @@ foo 1 bar"""
     timesheet_entries = timesheet.entries.filter(pushed=False)
 
     assert len(list(timesheet_entries.values())[0]) == 2
+
+
+def test_get_entries_in_date_range_keeps_timesheet_order():
+    contents = """12.10.2012
+foo 1 Foo
+
+10.10.2012
+foo 2 Foo
+
+11.10.2012
+foo 3 Foo
+
+09.10.2012
+foo 4 Foo"""
+    t = create_timesheet(contents)
+    entries = t.entries.filter(date=(datetime.date(2012, 10, 10), datetime.date(2012, 10, 12)))
+
+    assert list(entries.keys()) == [
+        datetime.date(2012, 10, 12), datetime.date(2012, 10, 10), datetime.date(2012, 10, 11)
+    ]
+
+
+def test_get_entries_in_open_date_range():
+    contents = """10.10.2012
+foo 2 Foo
+
+11.10.2012
+foo 3 Foo"""
+    t = create_timesheet(contents)
+
+    assert list(t.entries.filter(date=(datetime.date(2012, 10, 11), None)).keys()) == [datetime.date(2012, 10, 11)]
+    assert list(t.entries.filter(date=(None, datetime.date(2012, 10, 10))).keys()) == [datetime.date(2012, 10, 10)]
+
+
+def test_get_entries_in_date_range_after_date_is_deleted():
+    contents = """10.10.2012
+foo 2 Foo
+
+11.10.2012
+foo 3 Foo"""
+    t = create_timesheet(contents)
+    del t.entries[datetime.date(2012, 10, 10)]
+    t.entries[datetime.date(2012, 10, 12)].append(Entry('foo', 1, 'Foo'))
+
+    assert list(t.entries.filter(date=(datetime.date(2012, 10, 10), None)).keys()) == [
+        datetime.date(2012, 10, 11), datetime.date(2012, 10, 12)
+    ]
+
+
+def test_get_entries_in_date_range_after_pop_and_update():
+    contents = """10.10.2012
+foo 2 Foo
+
+11.10.2012
+foo 3 Foo"""
+    t = create_timesheet(contents)
+    t.entries.filter(date=(datetime.date(2012, 10, 10), None))
+    entries = t.entries.pop(datetime.date(2012, 10, 10))
+    t.entries.update({datetime.date(2012, 10, 12): entries})
+
+    assert list(t.entries.filter(date=(datetime.date(2012, 10, 10), None)).keys()) == [
+        datetime.date(2012, 10, 11), datetime.date(2012, 10, 12)
+    ]
@@ -1,4 +1,5 @@
 import datetime
+import io
 
 import pytest
 
@@ -90,6 +91,26 @@ def test_invalid_date(date):
         TimesheetParser().parse_text(date)
 
 
+def test_out_of_range_date_raises_parse_error():
+    content = """01/01/2014
+foo 1 bar
+31/02/2014
+foo 1 bar"""
+
+    with pytest.raises(ParseError) as excinfo:
+        TimesheetParser().parse_text(content)
+
+    assert excinfo.value.line_number == 3
+
+
+def test_alias_starting_with_date_like_text():
+    lines = TimesheetParser().parse_text("""01/01/2014
+12-31-99_x 1 bar""")
+
+    assert isinstance(lines[1], Entry)
+    assert lines[1].alias == '12-31-99_x'
+
+
 def test_invalid_line():
     content = """10.01.2013
 foobar 0900-1000 baz
@@ -319,3 +340,44 @@ alias_1 0845-0960 xxx
 
     with pytest.raises(ParseError):
         TimesheetParser().parse_text(contents)
+
+
+def test_entry_line_regexp_is_shared_between_parsers_with_same_flags():
+    assert TimesheetParser().entry_line_regexp is TimesheetParser().entry_line_regexp
+
+
+def test_entry_line_regexp_is_not_shared_between_parsers_with_different_flags():
+    custom_flags_parser = TimesheetParser(flags_repr={Entry.FLAG_IGNORED: '!', Entry.FLAG_PUSHED: '*'})
+
+    assert custom_flags_parser.entry_line_regexp is not TimesheetParser().entry_line_regexp
+    assert custom_flags_parser.parse_line('! foo 2 bar').ignored
+
+
+def test_alias_starting_with_digits_is_parsed_as_entry():
+    lines = TimesheetParser().parse_text("""01.01.2013
+2014 1 foo
+""")
+
+    assert isinstance(lines[-1], Entry)
+    assert lines[-1].alias == '2014'
+
+
+def test_iter_parse_reads_file_object():
+    fileobj = io.StringIO("\n01.01.2013\n\nfoo 2 bar\n\n\n")
+    lines = TimesheetParser().iter_parse(fileobj)
+
+    assert isinstance(next(lines), DateLine)
+    assert isinstance(next(lines), TextLine)
+    assert next(lines).alias == 'foo'
+    with pytest.raises(StopIteration):
+        next(lines)
+
+
+def test_iter_parse_error_contains_line_number():
+    fileobj = io.StringIO("01.01.2013\nfoo 2 bar\n\nhello world\n")
+
+    with pytest.raises(ParseError) as excinfo:
+        list(TimesheetParser().iter_parse(fileobj))
+
+    assert excinfo.value.line_number == 4
+    assert excinfo.value.line == 'hello world'
@@ -4,7 +4,7 @@ import pytest
 from freezegun import freeze_time
 
 from taxi.exceptions import EntriesCollectionValidationError
-from taxi.timesheet import EntriesCollection, Entry, Timesheet, TimesheetParser
+from taxi.timesheet import EntriesCollection, Entry, Timesheet, TimesheetCollection, TimesheetParser
 
 from . import create_timesheet
 
@@ -130,3 +130,36 @@ foo 2300-0100 baz"""
 
     with pytest.raises(EntriesCollectionValidationError):
         create_timesheet(contents)
+
+
+def test_load_timesheet_from_file(tmpdir):
+    timesheet_file = tmpdir.join('timesheet.tks')
+    timesheet_file.write("10.10.2012\nfoo 09:00-10:00 baz\n\n11.10.2012\nbar 2 qux\n")
+
+    t = Timesheet.load(str(timesheet_file))
+
+    assert len(t.entries) == 2
+    assert t.entries[datetime.date(2012, 10, 11)][0].alias == 'bar'
+    assert str(t) == "10.10.2012\nfoo 09:00-10:00 baz\n\n11.10.2012\nbar 2 qux"
+
+
+def test_timesheet_collection_entries_merges_timesheets_entries():
+    timesheets = [
+        create_timesheet("10.10.2012\nfoo 1 baz\n\n11.10.2012\nfoo 2 baz"),
+        create_timesheet("11.10.2012\nbar 3 baz\n\n12.10.2012\nbar 4 baz"),
+    ]
+    entries = TimesheetCollection(timesheets).entries
+
+    assert list(entries.keys()) == [
+        datetime.date(2012, 10, 10), datetime.date(2012, 10, 11), datetime.date(2012, 10, 12)
+    ]
+    assert [entry.hours for entry in entries[datetime.date(2012, 10, 11)]] == [2, 3]
+    assert entries[datetime.date(2012, 10, 11)][1] is timesheets[1].entries[datetime.date(2012, 10, 11)][0]
+
+
+def test_timesheet_collection_entries_doesnt_change_timesheets():
+    timesheets = [create_timesheet("10.10.2012\nfoo 1 baz"), create_timesheet("11.10.2012\nbar 3 baz")]
+    TimesheetCollection(timesheets).entries[datetime.date(2012, 10, 10)].append(Entry('bar', 1, 'baz'))
+
+    assert len(timesheets[0].entries[datetime.date(2012, 10, 10)]) == 1
+    assert str(timesheets[0]) == "10.10.2012\nfoo 1 baz"